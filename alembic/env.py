@@ -4,8 +4,9 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
-from db.db_setup import Base
-from db.model import user,course
+from db.db_setup import Base, DATABASE_URL
+# Every model, so autogenerate compares against the whole schema.
+from db.model import user, profile, role, menuitem, station, transfer, dispatcher, company, vehicle, station_summary, supply_region, account_region, notification, tombstone, transfer_rollup, course
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -16,6 +17,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Migrate the same database the app connects to (DATABASE_URL).
+config.set_main_option("sqlalchemy.url", DATABASE_URL)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
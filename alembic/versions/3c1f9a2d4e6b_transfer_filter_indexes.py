@@ -0,0 +1,36 @@
+"""transfer filter indexes
+
+Revision ID: 3c1f9a2d4e6b
+Revises: a9f3e6d1c8b2
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from db.migration_ops import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a2d4e6b'
+down_revision: Union[str, None] = 'a9f3e6d1c8b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_transfers_company_date', 'transfers', ['CompanyId', 'DateRealized']),
+    ('ix_transfers_dispatcher_date', 'transfers', ['DispatcherId', 'DateRealized']),
+    ('ix_transfers_vehicle_date', 'transfers', ['VehicleId', 'DateRealized']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_indexes_concurrently(INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_indexes_concurrently(INDEXES)
@@ -0,0 +1,56 @@
+"""changes feed: updated_at indexes and tombstones
+
+Revision ID: 5a7d2c8e1f90
+Revises: 3c1f9a2d4e6b
+Create Date: 2026-10-18 17:31:07.214553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from db.migration_ops import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d2c8e1f90'
+down_revision: Union[str, None] = '3c1f9a2d4e6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every table with the Timestamp mixin.
+TABLES = [
+    'users', 'profiles', 'rolelist', 'menuitems', 'stations', 'transfers',
+    'dispatchers', 'companies', 'vehicles', 'station_summaries', 'supply_regions',
+    'account_regions', 'notifications', 'courses', 'sections', 'student_courses',
+    'content_blocks', 'completed_content_blocks',
+]
+
+
+def _updated_at_indexes(existing):
+    return [(f'ix_{table}_updated_at', table, ['updated_at']) for table in TABLES if table in existing]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('resource', sa.String(length=50), nullable=False),
+        sa.Column('resource_id', sa.String(length=50), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tombstones_resource_id', 'tombstones', ['resource', 'id'], unique=False)
+    # The course tables only exist in databases built from the first revision.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    create_indexes_concurrently(_updated_at_indexes(existing))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    drop_indexes_concurrently(_updated_at_indexes(existing))
+    op.drop_index('ix_tombstones_resource_id', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,39 @@
+"""transfer daily rollups
+
+Revision ID: 8e4b6f0c2a17
+Revises: 5a7d2c8e1f90
+Create Date: 2026-10-18 18:02:55.918204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b6f0c2a17'
+down_revision: Union[str, None] = '5a7d2c8e1f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by the first rollup refresh after deploy.
+    op.create_table(
+        'transfer_daily_rollups',
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.Column('CompanyId', sa.String(length=10), nullable=False),
+        sa.Column('DispatcherId', sa.String(length=10), nullable=False),
+        sa.Column('VehicleId', sa.String(length=10), nullable=False),
+        sa.Column('transfers', sa.Integer(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'CompanyId', 'DispatcherId', 'VehicleId'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transfer_daily_rollups')
@@ -0,0 +1,225 @@
+"""app tables
+
+Revision ID: a9f3e6d1c8b2
+Revises: 7b5ee9b4496b
+Create Date: 2026-10-18 21:05:32.740196
+
+The application tables as create_all built them before Alembic owned the
+schema (the models at that time, frozen here). Databases that already have
+a table keep it; migrate.py stamps databases from that era at this
+revision instead of running it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9f3e6d1c8b2'
+down_revision: Union[str, None] = '7b5ee9b4496b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables() -> list:
+    """(name, columns, [(index name, columns, unique)]) in creation order."""
+    return [
+        ('account_regions', [
+            sa.Column('Id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('Id')
+        ], [('ix_account_regions_Id', ['Id'], False)]),
+        ('companies', [
+            sa.Column('CompanyId', sa.String(length=10), nullable=False),
+            sa.Column('CompanyName', sa.String(length=100), nullable=False),
+            sa.Column('OwnerId', sa.String(length=50), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('CompanyId')
+        ], [('ix_companies_CompanyId', ['CompanyId'], False)]),
+        ('dispatchers', [
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('IMEI', sa.String(length=50), nullable=True),
+            sa.Column('StationId', sa.Integer(), nullable=True),
+            sa.Column('DispatcherName', sa.String(length=100), nullable=False),
+            sa.Column('LastUpdateDate', sa.DateTime(), nullable=True),
+            sa.Column('GrandTotal', sa.Float(), nullable=True),
+            sa.Column('K', sa.String(length=50), nullable=True),
+            sa.Column('isActive', sa.Integer(), nullable=True),
+            sa.Column('DaviceId', sa.String(length=50), nullable=True),
+            sa.Column('Version', sa.DateTime(), nullable=True),
+            sa.Column('Tell', sa.Integer(), nullable=True),
+            sa.Column('City', sa.String(length=100), nullable=True),
+            sa.Column('PName', sa.String(length=100), nullable=True),
+            sa.Column('District', sa.String(length=100), nullable=True),
+            sa.Column('PumpModel', sa.Integer(), nullable=True),
+            sa.Column('isNotificationMailActive', sa.String(length=100), nullable=True),
+            sa.Column('CompanyId', sa.String(length=10), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_dispatchers_id', ['id'], False)]),
+        ('menuitems', [
+            sa.Column('menuID', sa.String(length=10), nullable=False),
+            sa.Column('menuDisplayname', sa.String(length=100), nullable=False),
+            sa.Column('menuurl', sa.String(length=255), nullable=True),
+            sa.Column('title', sa.String(length=100), nullable=True),
+            sa.Column('subtitle', sa.String(length=100), nullable=True),
+            sa.Column('type', sa.String(length=50), nullable=True),
+            sa.Column('icon', sa.String(length=100), nullable=True),
+            sa.Column('translate', sa.String(length=100), nullable=True),
+            sa.Column('translateKey', sa.String(length=100), nullable=True),
+            sa.Column('children', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('menuID')
+        ], [('ix_menuitems_menuID', ['menuID'], False)]),
+        ('notifications', [
+            sa.Column('id', sa.String(length=50), nullable=False),
+            sa.Column('company_id', sa.Integer(), nullable=True),
+            sa.Column('station_id', sa.Integer(), nullable=True),
+            sa.Column('dispatcher_id', sa.Integer(), nullable=True),
+            sa.Column('transfer_batch_total', sa.Float(), nullable=True),
+            sa.Column('transfer_grand_total_start', sa.Float(), nullable=True),
+            sa.Column('transfer_create_date', sa.DateTime(), nullable=True),
+            sa.Column('company_name', sa.String(length=100), nullable=True),
+            sa.Column('station_name', sa.String(length=100), nullable=True),
+            sa.Column('dispatcher_name', sa.String(length=100), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_notifications_id', ['id'], False)]),
+        ('rolelist', [
+            sa.Column('id', sa.String(length=10), nullable=False),
+            sa.Column('RoleName', sa.String(length=50), nullable=False),
+            sa.Column('menuitems', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_rolelist_id', ['id'], False)]),
+        ('station_summaries', [
+            sa.Column('id', sa.String(length=10), nullable=False),
+            sa.Column('supplyId', sa.Integer(), nullable=True),
+            sa.Column('accountId', sa.Integer(), nullable=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('address', sa.String(length=255), nullable=True),
+            sa.Column('taxOffice', sa.String(length=100), nullable=True),
+            sa.Column('taxNumber', sa.String(length=20), nullable=True),
+            sa.Column('lat', sa.Float(), nullable=True),
+            sa.Column('lng', sa.Float(), nullable=True),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('order', sa.Integer(), nullable=True),
+            sa.Column('city', sa.String(length=100), nullable=True),
+            sa.Column('PumperId', sa.Integer(), nullable=True),
+            sa.Column('CompanyId', sa.String(length=10), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('Dispatchers', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_station_summaries_id', ['id'], False)]),
+        ('stations', [
+            sa.Column('id', sa.String(length=10), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('address', sa.String(length=255), nullable=True),
+            sa.Column('taxOffice', sa.String(length=100), nullable=True),
+            sa.Column('taxNumber', sa.String(length=20), nullable=True),
+            sa.Column('lat', sa.Float(), nullable=True),
+            sa.Column('lng', sa.Float(), nullable=True),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('order', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('PumperId', sa.Integer(), nullable=True),
+            sa.Column('city', sa.String(length=100), nullable=True),
+            sa.Column('CompanyId', sa.String(length=10), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_stations_id', ['id'], False)]),
+        ('supply_regions', [
+            sa.Column('Id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('Id')
+        ], [('ix_supply_regions_Id', ['Id'], False)]),
+        ('transfers', [
+            sa.Column('id', sa.String(length=10), nullable=False),
+            sa.Column('OID', sa.Integer(), nullable=True),
+            sa.Column('CompanyId', sa.String(length=10), nullable=True),
+            sa.Column('DispatcherId', sa.String(length=10), nullable=True),
+            sa.Column('VehicleId', sa.String(length=10), nullable=True),
+            sa.Column('Status', sa.String(length=20), nullable=True),
+            sa.Column('DateRealized', sa.DateTime(), nullable=True),
+            sa.Column('CreateDate', sa.Integer(), nullable=True),
+            sa.Column('GrandTotalStart', sa.Float(), nullable=True),
+            sa.Column('BatchTotal', sa.Float(), nullable=True),
+            sa.Column('Type', sa.String(length=50), nullable=True),
+            sa.Column('BatchPrice', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_transfers_id', ['id'], False)]),
+        ('users', [
+            sa.Column('id', sa.String(length=50), nullable=False),
+            sa.Column('email', sa.String(length=100), nullable=False),
+            sa.Column('password', sa.String(length=255), nullable=False),
+            sa.Column('role', sa.Enum('admin', 'staff', 'user', name='role'), nullable=False),
+            sa.Column('roleID', sa.String(length=10), nullable=False),
+            sa.Column('displayName', sa.String(length=100), nullable=False),
+            sa.Column('photoURL', sa.String(length=255), nullable=True),
+            sa.Column('pmpRestriction', sa.JSON(), nullable=True),
+            sa.Column('settings', sa.JSON(), nullable=True),
+            sa.Column('shortcuts', sa.JSON(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_users_email', ['email'], True), ('ix_users_id', ['id'], False)]),
+        ('vehicles', [
+            sa.Column('VehicleId', sa.String(length=10), nullable=False),
+            sa.Column('OID', sa.String(length=10), nullable=True),
+            sa.Column('Company', sa.String(length=100), nullable=True),
+            sa.Column('CardName', sa.String(length=100), nullable=True),
+            sa.Column('MonthLimit', sa.Float(), nullable=True),
+            sa.Column('MontTransfer', sa.Float(), nullable=True),
+            sa.Column('Totaltransfer', sa.Float(), nullable=True),
+            sa.Column('CardTypeID', sa.String(length=50), nullable=True),
+            sa.Column('RfId', sa.String(length=50), nullable=True),
+            sa.Column('IsActive', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('VehicleId')
+        ], [('ix_vehicles_VehicleId', ['VehicleId'], False)]),
+        ('profiles', [
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('first_name', sa.String(length=50), nullable=False),
+            sa.Column('last_name', sa.String(length=50), nullable=False),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('user_id', sa.String(length=50), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        ], [('ix_profiles_id', ['id'], False)]),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, columns, indexes in _tables():
+        if name in existing:
+            continue
+        op.create_table(name, *columns)
+        for index_name, index_columns, unique in indexes:
+            op.create_index(index_name, name, index_columns, unique=unique)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in reversed(_tables()):
+        op.drop_table(name)
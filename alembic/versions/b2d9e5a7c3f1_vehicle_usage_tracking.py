@@ -0,0 +1,32 @@
+"""vehicle usage tracking
+
+Revision ID: b2d9e5a7c3f1
+Revises: 8e4b6f0c2a17
+Create Date: 2026-10-18 18:40:13.552871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d9e5a7c3f1'
+down_revision: Union[str, None] = '8e4b6f0c2a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('vehicles', sa.Column('UsageMonth', sa.DateTime(), nullable=True))
+    op.add_column('transfers', sa.Column('LimitExceeded', sa.Boolean(), nullable=True))
+    # Existing MontTransfer values are taken to be this month's usage.
+    op.execute("UPDATE vehicles SET \"UsageMonth\" = date_trunc('month', now() AT TIME ZONE 'utc')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('transfers', 'LimitExceeded')
+    op.drop_column('vehicles', 'UsageMonth')
@@ -0,0 +1,48 @@
+"""transfer rollup watermark and date index
+
+Revision ID: d4a8c1e7f305
+Revises: b2d9e5a7c3f1
+Create Date: 2026-10-18 20:14:07.381552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from db.migration_ops import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c1e7f305'
+down_revision: Union[str, None] = 'b2d9e5a7c3f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_transfers_date', 'transfers', ['DateRealized']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'transfer_rollup_stale_days',
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('day'),
+    )
+    # No row yet: the first refresh after deploy rebuilds every day.
+    op.create_table(
+        'transfer_rollup_watermark',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('refreshed_until', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    create_indexes_concurrently(INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_indexes_concurrently(INDEXES)
+    op.drop_table('transfer_rollup_watermark')
+    op.drop_table('transfer_rollup_stale_days')
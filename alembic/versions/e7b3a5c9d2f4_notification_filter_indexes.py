@@ -0,0 +1,36 @@
+"""notification filter indexes
+
+Revision ID: e7b3a5c9d2f4
+Revises: d4a8c1e7f305
+Create Date: 2026-10-18 22:41:19.604285
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from db.migration_ops import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3a5c9d2f4'
+down_revision: Union[str, None] = 'd4a8c1e7f305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_notifications_company_date', 'notifications', ['company_id', 'transfer_create_date']),
+    ('ix_notifications_station_date', 'notifications', ['station_id', 'transfer_create_date']),
+    ('ix_notifications_date', 'notifications', ['transfer_create_date']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_indexes_concurrently(INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_indexes_concurrently(INDEXES)
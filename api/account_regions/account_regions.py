@@ -1,12 +1,16 @@
 # api/account_regions/account_regions.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_account_regions, get_account_region, create_account_region, update_account_region, delete_account_region
-from ...models.account_region import AccountRegion
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import account_region_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from db.model.account_region import AccountRegion
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/account-regions", tags=["account_regions"])
 
@@ -26,60 +30,96 @@ class AccountRegionResponse(AccountRegionBase):
         from_attributes = True
 
 @router.get("/", response_model=List[AccountRegionResponse])
-def get_account_regions_list(
+async def get_account_regions_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_account_regions(db, skip, limit)
+    try:
+        selected = parse_fields(fields, AccountRegionResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await account_region_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, AccountRegionResponse, selected)
 
 @router.post("/", response_model=AccountRegionResponse)
-def create_account_region_endpoint(
+async def create_account_region_endpoint(
     region: AccountRegionCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_region = create_account_region(db, region.dict())
+    db_region = await account_region_repo.create(db, region.dict())
     return db_region
 
+@router.get("/changes", response_model=ChangesResponse[AccountRegionResponse])
+async def get_account_region_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await account_region_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{Id}", response_model=AccountRegionResponse)
-def get_account_region_endpoint(
+async def get_account_region_endpoint(
     Id: int,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_region = get_account_region(db, Id)
+    db_region = await account_region_repo.get(db, Id)
     if not db_region:
         raise HTTPException(status_code=404, detail="Account region not found")
+    cached = not_modified(request, response, row_etag(db_region))
+    if cached:
+        return cached
     return db_region
 
 @router.put("/{Id}", response_model=AccountRegionResponse)
-def update_account_region_endpoint(
+async def update_account_region_endpoint(
     Id: int,
     region: AccountRegionUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_region = update_account_region(db, Id, region.dict(exclude_unset=True))
+    db_region = await account_region_repo.update(db, Id, region.dict(exclude_unset=True))
     if not db_region:
         raise HTTPException(status_code=404, detail="Account region not found")
     return db_region
 
 @router.delete("/{Id}", response_model=dict)
-def delete_account_region_endpoint(
+async def delete_account_region_endpoint(
     Id: int,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_account_region(db, Id):
+    if not await account_region_repo.delete(db, Id):
         raise HTTPException(status_code=404, detail="Account region not found")
     return {"message": "Account region deleted"}
\ No newline at end of file
@@ -0,0 +1,59 @@
+# api/analytics/analytics.py
+from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.analytics import transfer_analytics, refresh_transfer_rollups, GROUP_BY
+from routes.auth import verify_token
+from datetime import datetime
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+class TransferAnalyticsRow(BaseModel):
+    # Owner id, or the start of the time bucket; None groups transfers without that owner.
+    key: Optional[str] = None
+    transfers: int
+    volume: float
+    revenue: float
+
+@router.get("/transfers", response_model=List[TransferAnalyticsRow])
+async def get_transfer_analytics(
+    group_by: str = Query(..., pattern="^(" + "|".join(GROUP_BY) + ")$"),
+    company_id: Optional[str] = Query(None),
+    dispatcher_id: Optional[str] = Query(None),
+    vehicle_id: Optional[str] = Query(None),
+    station_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="DateRealized lower bound (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="DateRealized upper bound (exclusive)"),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    rows = await transfer_analytics(
+        db, group_by,
+        company_id=company_id,
+        dispatcher_id=dispatcher_id,
+        vehicle_id=vehicle_id,
+        station_id=station_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    for row in rows:
+        key = row["key"]
+        if key is not None:
+            row["key"] = key.isoformat() if isinstance(key, datetime) else str(key)
+    return rows
+
+@router.post("/rollups/refresh", response_model=dict)
+async def refresh_transfer_rollups_endpoint(
+    full: bool = Query(False, description="Rebuild every day instead of the recently written ones"),
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    rebuilt = await refresh_transfer_rollups(full)
+    if rebuilt == -2:
+        raise HTTPException(status_code=409, detail="A refresh is already running")
+    return {"message": "Transfer rollups refreshed", "days": "all" if rebuilt == -1 else rebuilt}
@@ -1,12 +1,16 @@
 # api/companies/companies.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_companies, get_company, create_company, update_company, delete_company
-from ...models.company import Company
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import company_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from db.model.company import Company
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
@@ -27,60 +31,96 @@ class CompanyResponse(CompanyBase):
         from_attributes = True
 
 @router.get("/", response_model=List[CompanyResponse])
-def get_companies_list(
+async def get_companies_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_companies(db, skip, limit)
+    try:
+        selected = parse_fields(fields, CompanyResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await company_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, CompanyResponse, selected)
 
 @router.post("/", response_model=CompanyResponse)
-def create_company_endpoint(
+async def create_company_endpoint(
     company: CompanyCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_company = create_company(db, company.dict())
+    db_company = await company_repo.create(db, company.dict())
     return db_company
 
+@router.get("/changes", response_model=ChangesResponse[CompanyResponse])
+async def get_company_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await company_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{CompanyId}", response_model=CompanyResponse)
-def get_company_endpoint(
+async def get_company_endpoint(
     CompanyId: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_company = get_company(db, CompanyId)
+    db_company = await company_repo.get(db, CompanyId)
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
+    cached = not_modified(request, response, row_etag(db_company))
+    if cached:
+        return cached
     return db_company
 
 @router.put("/{CompanyId}", response_model=CompanyResponse)
-def update_company_endpoint(
+async def update_company_endpoint(
     CompanyId: str,
     company: CompanyUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_company = update_company(db, CompanyId, company.dict(exclude_unset=True))
+    db_company = await company_repo.update(db, CompanyId, company.dict(exclude_unset=True))
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
     return db_company
 
 @router.delete("/{CompanyId}", response_model=dict)
-def delete_company_endpoint(
+async def delete_company_endpoint(
     CompanyId: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_company(db, CompanyId):
+    if not await company_repo.delete(db, CompanyId):
         raise HTTPException(status_code=404, detail="Company not found")
     return {"message": "Company deleted"}
\ No newline at end of file
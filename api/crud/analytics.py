@@ -0,0 +1,241 @@
+# analytics.py
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import String, cast, delete, func, insert, select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import AsyncSessionLocal
+from db.model.dispatcher import Dispatcher
+from db.model.transfer import TransfersDispatcher
+from db.model.transfer_rollup import TransferDailyRollup, TransferRollupStaleDay, TransferRollupWatermark
+from api.crud.bulk import insert_for
+from api.crud.changes import CHANGES_SAFETY_LAG_SECONDS
+
+TRANSFER_ROLLUP_REFRESH_SECONDS = float(os.getenv("TRANSFER_ROLLUP_REFRESH_SECONDS", "300"))
+# Days always rebuilt on refresh, on top of the days written since the last one.
+TRANSFER_ROLLUP_TRAILING_DAYS = int(os.getenv("TRANSFER_ROLLUP_TRAILING_DAYS", "2"))
+
+GROUP_BY = ("company", "station", "dispatcher", "vehicle", "hour", "day", "month")
+TIME_BUCKETS = ("hour", "day", "month")
+_OWNER_COLUMNS = {"company": "CompanyId", "dispatcher": "DispatcherId", "vehicle": "VehicleId"}
+# pg advisory lock id, so only one worker process refreshes at a time.
+_REFRESH_LOCK_ID = 7_301_002
+_SQLITE_FORMATS = {"hour": "%Y-%m-%d %H:00:00", "day": "%Y-%m-%d 00:00:00", "month": "%Y-%m-01 00:00:00"}
+
+
+def _truncate(dialect: str, unit: str, column):
+    if dialect == "sqlite":
+        return func.strftime(_SQLITE_FORMATS[unit], column)
+    return func.date_trunc(unit, column)
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    day = _floor_day(value)
+    return day if day == value else day + timedelta(days=1)
+
+
+def _bucket_value(value):
+    # date_trunc returns datetimes, SQLite's strftime returns text.
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _aggregate(
+    dialect: str,
+    source,
+    time_column,
+    measures: list,
+    group_by: str,
+    ranges: List[Tuple[Optional[datetime], Optional[datetime]]],
+    company_id: Optional[str],
+    dispatcher_id: Optional[str],
+    vehicle_id: Optional[str],
+    station_id: Optional[int],
+):
+    """GROUP BY query over transfers or the rollups, which share the owner column names."""
+    if group_by in TIME_BUCKETS:
+        key = _truncate(dialect, group_by, time_column)
+    elif group_by == "station":
+        key = Dispatcher.StationId
+    else:
+        key = getattr(source, _OWNER_COLUMNS[group_by])
+    stmt = select(key.label("key"), *measures).select_from(source)
+    if group_by == "station" or station_id is not None:
+        # Transfers reach their station through their dispatcher.
+        stmt = stmt.join(Dispatcher, cast(Dispatcher.id, String) == source.DispatcherId)
+    if station_id is not None:
+        stmt = stmt.where(Dispatcher.StationId == station_id)
+    for name, value in (("CompanyId", company_id), ("DispatcherId", dispatcher_id), ("VehicleId", vehicle_id)):
+        if value is not None:
+            stmt = stmt.where(getattr(source, name) == value)
+    bounds = []
+    for start, end in ranges:
+        clauses = []
+        if start is not None:
+            clauses.append(time_column >= start)
+        if end is not None:
+            clauses.append(time_column < end)
+        if not clauses:
+            # An unbounded range matches every row; no WHERE at all.
+            bounds = []
+            break
+        bounds.append(and_(*clauses))
+    if bounds:
+        stmt = stmt.where(or_(*bounds))
+    return stmt.group_by(key)
+
+
+async def transfer_analytics(
+    db: AsyncSession,
+    group_by: str,
+    company_id: Optional[str] = None,
+    dispatcher_id: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    station_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> List[dict]:
+    """
+    Transfer count, volume (sum of BatchTotal) and revenue (sum of BatchPrice) per group.
+
+    Whole days before today are read from the daily rollups; today and any
+    partial days at the edges of [date_from, date_to) come from transfers, and
+    both halves are summed per key. Hourly buckets always read transfers.
+    """
+    dialect = db.get_bind().dialect.name
+    filters = dict(company_id=company_id, dispatcher_id=dispatcher_id, vehicle_id=vehicle_id, station_id=station_id)
+
+    rollup_start = _ceil_day(date_from) if date_from is not None else None
+    rollup_end = _floor_day(datetime.utcnow())
+    if date_to is not None:
+        rollup_end = min(rollup_end, _floor_day(date_to))
+    use_rollup = group_by != "hour" and (rollup_start is None or rollup_start < rollup_end)
+
+    statements = []
+    if use_rollup:
+        rollup = TransferDailyRollup
+        statements.append(_aggregate(
+            dialect, rollup, rollup.day,
+            [func.sum(rollup.transfers), func.sum(rollup.volume), func.sum(rollup.revenue)],
+            group_by, [(rollup_start, rollup_end)], **filters,
+        ))
+        raw_ranges = [(rollup_end, date_to)]
+        if date_from is not None and date_from < rollup_start:
+            raw_ranges.append((date_from, rollup_start))
+    else:
+        raw_ranges = [(date_from, date_to)]
+    transfers = TransfersDispatcher
+    statements.append(_aggregate(
+        dialect, transfers, transfers.DateRealized,
+        [func.count(), func.coalesce(func.sum(transfers.BatchTotal), 0), func.coalesce(func.sum(transfers.BatchPrice), 0)],
+        group_by, raw_ranges, **filters,
+    ))
+
+    totals = {}
+    for stmt in statements:
+        for key, count, volume, revenue in await db.execute(stmt):
+            if group_by in TIME_BUCKETS:
+                key = _bucket_value(key)
+            elif key == "":
+                key = None
+            row = totals.setdefault(key, {"key": key, "transfers": 0, "volume": 0.0, "revenue": 0.0})
+            row["transfers"] += count
+            row["volume"] += volume or 0.0
+            row["revenue"] += revenue or 0.0
+    return sorted(totals.values(), key=lambda row: (row["key"] is None, row["key"] if row["key"] is not None else ""))
+
+
+def _rollup_select(dialect: str, days_clause=None):
+    transfers = TransfersDispatcher
+    day = _truncate(dialect, "day", transfers.DateRealized)
+    if dialect == "sqlite":
+        # The text layout SQLAlchemy uses for DateTime on SQLite, so the stored
+        # days compare equal to bound datetimes.
+        day = func.strftime("%Y-%m-%d 00:00:00.000000", transfers.DateRealized)
+    stmt = (
+        select(
+            day.label("day"),
+            func.coalesce(transfers.CompanyId, ""),
+            func.coalesce(transfers.DispatcherId, ""),
+            func.coalesce(transfers.VehicleId, ""),
+            func.count(),
+            func.coalesce(func.sum(transfers.BatchTotal), 0),
+            func.coalesce(func.sum(transfers.BatchPrice), 0),
+        )
+        .where(transfers.DateRealized.isnot(None))
+        .group_by(day, func.coalesce(transfers.CompanyId, ""), func.coalesce(transfers.DispatcherId, ""), func.coalesce(transfers.VehicleId, ""))
+    )
+    if days_clause is not None:
+        stmt = stmt.where(days_clause)
+    return insert(TransferDailyRollup).from_select(
+        ["day", "CompanyId", "DispatcherId", "VehicleId", "transfers", "volume", "revenue"], stmt
+    )
+
+
+async def mark_days_stale(db: AsyncSession, values: Iterable[Optional[datetime]]) -> None:
+    """
+    Queue the days of these DateRealized values for the next refresh, in the
+    caller's transaction. For transfers leaving a day (deleted, or moved to
+    another one): the refresh finds the days transfers arrive at through
+    updated_at, but nothing is left there to find the day they came from.
+    """
+    days = {_floor_day(value) for value in values if value is not None}
+    if days:
+        stmt = insert_for(db)(TransferRollupStaleDay).on_conflict_do_nothing()
+        await db.execute(stmt, [{"day": day} for day in days])
+
+
+async def refresh_transfer_rollups(full: bool = False) -> int:
+    """
+    Rebuild the daily rollups of every day that had a transfer written since
+    the last refresh, the days queued by mark_days_stale and the trailing
+    days; everything when full is set, or when the rollups or the watermark
+    are missing. The watermark is stored with the rollups, so restarts and
+    other workers pick up where the last refresh stopped. Transfers loaded
+    offline with an old updated_at still need a full refresh.
+    Returns the number of days rebuilt (-1 for all of them, -2 if another
+    worker holds the refresh lock).
+    """
+    started = datetime.utcnow() - timedelta(seconds=CHANGES_SAFETY_LAG_SECONDS)
+    async with AsyncSessionLocal() as db:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql" and not await db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_ID))):
+            return -2
+        watermark = await db.get(TransferRollupWatermark, 1)
+        if not full:
+            full = watermark is None or await db.scalar(select(TransferDailyRollup.day).limit(1)) is None
+        if full:
+            await db.execute(delete(TransferDailyRollup))
+            await db.execute(_rollup_select(dialect))
+            await db.execute(delete(TransferRollupStaleDay))
+            rebuilt = -1
+        else:
+            transfers = TransfersDispatcher
+            today = _floor_day(datetime.utcnow())
+            days = {today - timedelta(days=offset) for offset in range(TRANSFER_ROLLUP_TRAILING_DAYS)}
+            touched = await db.scalars(
+                select(_truncate(dialect, "day", transfers.DateRealized))
+                .where(transfers.updated_at > watermark.refreshed_until, transfers.DateRealized.isnot(None))
+                .distinct()
+            )
+            days.update(_bucket_value(day) for day in touched)
+            # Only the days read here are dequeued; ones queued meanwhile wait for the next run.
+            stale = list(await db.scalars(select(TransferRollupStaleDay.day)))
+            days.update(stale)
+            await db.execute(delete(TransferDailyRollup).where(TransferDailyRollup.day.in_(days)))
+            day_ranges = [and_(transfers.DateRealized >= day, transfers.DateRealized < day + timedelta(days=1)) for day in sorted(days)]
+            await db.execute(_rollup_select(dialect, or_(*day_ranges)))
+            if stale:
+                await db.execute(delete(TransferRollupStaleDay).where(TransferRollupStaleDay.day.in_(stale)))
+            rebuilt = len(days)
+        if watermark is None:
+            db.add(TransferRollupWatermark(id=1, refreshed_until=started))
+        else:
+            watermark.refreshed_until = started
+        await db.commit()
+    return rebuilt
@@ -0,0 +1,315 @@
+# async_crud.py
+from sqlalchemy import Select, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.model.user import User as UserModel
+from db.model.profile import Profile
+from db.model.role import RoleList
+from db.model.menuitem import MenuItem
+from db.model.station import StationItem
+from db.model.transfer import TransfersDispatcher
+from db.model.dispatcher import Dispatcher
+from db.model.company import Company
+from db.model.vehicle import Vehicle
+from db.model.station_summary import StationSummary
+from db.model.supply_region import SupplyRegion
+from db.model.account_region import AccountRegion
+from db.model.notification import Notification
+from api.crud.hashing import hash_password_async
+from api.crud import analytics, events, menu_cache, summary_refresh, vehicle_limits
+from api.crud.bulk import BulkResponse
+from api.crud.repository import Repository
+from datetime import datetime
+from typing import Optional, List, Tuple
+
+# One Repository per resource, used by the routers through get_async_db.
+# Resource-specific behaviour (password hashing, vehicle limits, events) lives
+# in the subclasses below; everything else is the shared implementation.
+# bcrypt is CPU bound, so hashing runs in the bounded process pool of
+# api/crud/hashing.py instead of on the event loop.
+
+def _mark_summaries_dirty(key=None) -> None:
+    summary_refresh.mark_dirty()
+
+def _invalidate_menus(key=None) -> None:
+    menu_cache.invalidate()
+
+class UserRepository(Repository[UserModel]):
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[UserModel]:
+        return await db.scalar(select(UserModel).where(UserModel.email == email))
+
+    async def create(self, db: AsyncSession, user_data: dict) -> UserModel:
+        hashed_password = await hash_password_async(user_data["password"])
+        values = dict(
+            id=user_data["id"],
+            email=user_data["email"],
+            password=hashed_password,
+            role=user_data["role"],
+            roleID=user_data["roleID"],
+            displayName=user_data["displayName"],
+            photoURL=user_data.get("photoURL"),
+            pmpRestriction=user_data.get("pmpRestriction"),
+            settings=user_data.get("settings"),
+            shortcuts=user_data.get("shortcuts"),
+            is_active=user_data.get("is_active", True)
+        )
+        db_user = await db.scalar(self._insert.values(**values))
+
+        # Create profile
+        first_name, last_name = user_data["displayName"].split(" ", 1) if " " in user_data["displayName"] else (user_data["displayName"], "")
+        await db.execute(insert(Profile).values(first_name=first_name, last_name=last_name, user_id=db_user.id))
+
+        await db.commit()
+        return db_user
+
+    async def update(self, db: AsyncSession, user_id: str, user_data: dict) -> Optional[UserModel]:
+        user_data = dict(user_data)
+        if user_data.get("password"):
+            user_data["password"] = await hash_password_async(user_data["password"])
+        return await super().update(db, user_id, user_data)
+
+    async def delete(self, db: AsyncSession, user_id: str) -> bool:
+        # profiles.user_id is NOT NULL; the profile goes in the same transaction.
+        await db.execute(delete(Profile).where(Profile.user_id == user_id))
+        return await super().delete(db, user_id)
+
+def transfer_filters(
+    company_id: Optional[str] = None,
+    dispatcher_id: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> list:
+    """WHERE clauses for the transfer filters; date_to is exclusive."""
+    conditions = []
+    if company_id is not None:
+        conditions.append(TransfersDispatcher.CompanyId == company_id)
+    if dispatcher_id is not None:
+        conditions.append(TransfersDispatcher.DispatcherId == dispatcher_id)
+    if vehicle_id is not None:
+        conditions.append(TransfersDispatcher.VehicleId == vehicle_id)
+    if status is not None:
+        conditions.append(TransfersDispatcher.Status == status)
+    if date_from is not None:
+        conditions.append(TransfersDispatcher.DateRealized >= date_from)
+    if date_to is not None:
+        conditions.append(TransfersDispatcher.DateRealized < date_to)
+    return conditions
+
+def transfer_sort(
+    company_id: Optional[str] = None,
+    dispatcher_id: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    DateRealized when an owner or date filter is set, so the ix_transfers_*_date
+    index that serves the filter also serves the (DateRealized, id) order;
+    None (order by id alone) otherwise.
+    """
+    if any(value is not None for value in (company_id, dispatcher_id, vehicle_id, date_from, date_to)):
+        return TransfersDispatcher.DateRealized
+    return None
+
+def transfers_export_query(columns: List[str], **filters) -> Select:
+    stmt = (
+        select(*[getattr(TransfersDispatcher, column) for column in columns])
+        .where(*transfer_filters(**filters))
+    )
+    sort = transfer_sort(**filters)
+    if sort is not None:
+        return stmt.order_by(sort.asc().nulls_last(), TransfersDispatcher.id)
+    return stmt.order_by(TransfersDispatcher.id)
+
+async def _transfer_events(db: AsyncSession, transfers: List[dict]) -> List[dict]:
+    # Transfers carry no station; it comes from their dispatcher.
+    dispatcher_ids = {int(t["DispatcherId"]) for t in transfers if (t.get("DispatcherId") or "").isdigit()}
+    stations = {}
+    if dispatcher_ids:
+        rows = await db.execute(select(Dispatcher.id, Dispatcher.StationId).where(Dispatcher.id.in_(dispatcher_ids)))
+        stations = {str(dispatcher_id): station_id for dispatcher_id, station_id in rows}
+    return [
+        events.row_event("transfer.created", t, t.get("CompanyId"), stations.get(t.get("DispatcherId")))
+        for t in transfers
+    ]
+
+async def _flag_limit_exceeded(db: AsyncSession, transfer_ids, exceeded: bool = True) -> None:
+    if transfer_ids:
+        await db.execute(
+            update(TransfersDispatcher)
+            .where(TransfersDispatcher.id.in_(transfer_ids))
+            .values(LimitExceeded=exceeded)
+            .execution_options(synchronize_session=False)
+        )
+
+async def _charge_vehicles(db: AsyncSession, transfers: List[dict]) -> None:
+    await _flag_limit_exceeded(db, list(await vehicle_limits.charge_transfers(db, transfers)))
+
+# Columns whose change moves a transfer's vehicle usage.
+_USAGE_COLUMNS = ("VehicleId", "BatchTotal", "DateRealized")
+
+class TransferRepository(Repository[TransfersDispatcher]):
+    async def _previous(self, db: AsyncSession, transfer_ids: List[str]) -> dict:
+        # Locked, so the values cannot change between this read and the write.
+        rows = await db.execute(
+            select(TransfersDispatcher.id, *[getattr(TransfersDispatcher, name) for name in _USAGE_COLUMNS])
+            .where(TransfersDispatcher.id.in_(transfer_ids))
+            .with_for_update()
+        )
+        return {row.id: dict(row._mapping) for row in rows}
+
+    async def _recharge(self, db: AsyncSession, previous: dict, records: List[dict]) -> Tuple[dict, set]:
+        """
+        Move vehicle usage and rollup days from the previous values of existing
+        transfers to the values in records, which may leave columns out.
+        Returns the re-charged transfers now over MonthLimit, by id, and the
+        ids of those now within it. Other transfers of the months whose usage
+        dropped back within the limit are unflagged here.
+        """
+        old, new = [], []
+        for record in records:
+            before = previous.get(record["id"])
+            if before is None:
+                continue
+            after = {**before, **{name: record[name] for name in _USAGE_COLUMNS if name in record}}
+            if after == before:
+                continue
+            old.append(before)
+            new.append(after)
+        await analytics.mark_days_stale(db, [
+            before["DateRealized"] for before, after in zip(old, new) if before["DateRealized"] != after["DateRealized"]
+        ])
+        await vehicle_limits.reverse_transfers(db, old)
+        exceeded = await vehicle_limits.charge_transfers(db, new)
+        await vehicle_limits.clear_limit_flags(db, old + new)
+        within = {after["id"] for after in new if after["id"] not in exceeded}
+        return exceeded, within
+
+    async def create(self, db: AsyncSession, transfer_data: dict) -> TransfersDispatcher:
+        # Raises LimitExceededError in reject mode; the vehicle update is rolled back with the transfer.
+        exceeded = await vehicle_limits.charge_transfers(db, [transfer_data])
+        if exceeded and vehicle_limits.VEHICLE_LIMIT_MODE == "reject":
+            await db.rollback()
+            raise exceeded[transfer_data["id"]]
+        values = dict(transfer_data, LimitExceeded=True) if exceeded else transfer_data
+        db_transfer = await super().create(db, values)
+        await events.publish(await _transfer_events(db, [events.row_data(db_transfer)]))
+        return db_transfer
+
+    async def update(self, db: AsyncSession, transfer_id: str, transfer_data: dict) -> Optional[TransfersDispatcher]:
+        if any(name in transfer_data for name in _USAGE_COLUMNS):
+            previous = await self._previous(db, [transfer_id])
+            # Same rules as create: reject mode refuses the change, flag mode marks it.
+            exceeded, within = await self._recharge(db, previous, [dict(transfer_data, id=transfer_id)])
+            if exceeded and vehicle_limits.VEHICLE_LIMIT_MODE == "reject":
+                await db.rollback()
+                raise exceeded[transfer_id]
+            if exceeded or within:
+                transfer_data = dict(transfer_data, LimitExceeded=bool(exceeded))
+        return await super().update(db, transfer_id, transfer_data)
+
+    async def delete(self, db: AsyncSession, transfer_id: str) -> bool:
+        previous = await self._previous(db, [transfer_id])
+        await analytics.mark_days_stale(db, [row["DateRealized"] for row in previous.values()])
+        await vehicle_limits.reverse_transfers(db, list(previous.values()))
+        await vehicle_limits.clear_limit_flags(db, list(previous.values()))
+        return await super().delete(db, transfer_id)
+
+    async def bulk_upsert(self, db: AsyncSession, records: List[dict], on_created=None) -> BulkResponse:
+        # The last record of an id wins, as in bulk_upsert.
+        latest = {record["id"]: record for record in records}
+        previous = await self._previous(db, list(latest))
+        # Existing transfers are re-charged here, new ones by _charge_vehicles
+        # once inserted; both are flagged rather than rejected, as for creates.
+        exceeded, within = await self._recharge(db, previous, list(latest.values()))
+        await _flag_limit_exceeded(db, list(exceeded))
+        await _flag_limit_exceeded(db, list(within), exceeded=False)
+        result = await super().bulk_upsert(db, records, on_created=_charge_vehicles)
+        created = {item.id for item in result.results if item.status == "created"}
+        await events.publish(await _transfer_events(db, [record for record in records if record["id"] in created]))
+        return result
+
+async def get_vehicle_usage(db: AsyncSession, vehicle_id: str) -> Optional[dict]:
+    row = (await db.execute(
+        select(Vehicle.MonthLimit, Vehicle.MontTransfer, Vehicle.UsageMonth).where(Vehicle.VehicleId == vehicle_id)
+    )).first()
+    if row is None:
+        return None
+    month_limit, usage, usage_month = row
+    month = vehicle_limits.month_start()
+    # Usage of a month the rollover job has not reached yet no longer counts.
+    if usage_month is not None and usage_month < month:
+        usage = 0.0
+    usage = usage or 0.0
+    return {
+        "VehicleId": vehicle_id,
+        "month": month,
+        "MonthLimit": month_limit,
+        "usage": usage,
+        "remaining": None if month_limit is None else month_limit - usage,
+    }
+
+def notification_filters(
+    company_id: Optional[int] = None,
+    station_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> list:
+    """WHERE clauses for the notification filters; date_to is exclusive."""
+    conditions = []
+    if company_id is not None:
+        conditions.append(Notification.company_id == company_id)
+    if station_id is not None:
+        conditions.append(Notification.station_id == station_id)
+    if date_from is not None:
+        conditions.append(Notification.transfer_create_date >= date_from)
+    if date_to is not None:
+        conditions.append(Notification.transfer_create_date < date_to)
+    return conditions
+
+def notification_sort(
+    company_id: Optional[int] = None,
+    station_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """transfer_create_date when a filter is set, as transfer_sort does for transfers."""
+    if any(value is not None for value in (company_id, station_id, date_from, date_to)):
+        return Notification.transfer_create_date
+    return None
+
+def notifications_export_query(columns: List[str], **filters) -> Select:
+    stmt = (
+        select(*[getattr(Notification, column) for column in columns])
+        .where(*notification_filters(**filters))
+    )
+    sort = notification_sort(**filters)
+    if sort is not None:
+        return stmt.order_by(sort.asc().nulls_last(), Notification.id)
+    return stmt.order_by(Notification.id)
+
+class NotificationRepository(Repository[Notification]):
+    async def create(self, db: AsyncSession, notification_data: dict) -> Notification:
+        db_notification = await super().create(db, notification_data)
+        await events.publish([
+            events.row_event("notification.created", events.row_data(db_notification), db_notification.company_id, db_notification.station_id)
+        ])
+        return db_notification
+
+user_repo = UserRepository(UserModel, UserModel.id)
+role_repo = Repository(RoleList, RoleList.id, on_change=menu_cache.invalidate)
+menuitem_repo = Repository(MenuItem, MenuItem.menuID, on_change=_invalidate_menus)
+station_repo = Repository(StationItem, StationItem.id, on_change=_mark_summaries_dirty)
+# Transfer writes do not wake the summary refresh: its activity window is
+# time-based, so the periodic run covers it, and pump ingest would otherwise
+# rebuild every summary about once a second.
+transfer_repo = TransferRepository(TransfersDispatcher, TransfersDispatcher.id)
+dispatcher_repo = Repository(Dispatcher, Dispatcher.id, on_change=_mark_summaries_dirty)
+company_repo = Repository(Company, Company.CompanyId)
+vehicle_repo = Repository(Vehicle, Vehicle.VehicleId)
+station_summary_repo = Repository(StationSummary, StationSummary.id)
+supply_region_repo = Repository(SupplyRegion, SupplyRegion.Id)
+account_region_repo = Repository(AccountRegion, AccountRegion.Id)
+notification_repo = NotificationRepository(Notification, Notification.id)
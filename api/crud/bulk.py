@@ -0,0 +1,97 @@
+# bulk.py
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Union
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Upper bound on records per bulk request, so a single call cannot hold a
+# transaction (and its row locks) open for too long.
+BULK_MAX_RECORDS = 5000
+
+
+class BulkItemResult(BaseModel):
+    id: Union[str, int]
+    status: str  # created, updated or duplicate
+
+
+class BulkResponse(BaseModel):
+    created: int
+    updated: int
+    results: List[BulkItemResult]
+
+
+def insert_for(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model,
+    key: InstrumentedAttribute,
+    records: List[dict],
+    on_created: Optional[Callable[[AsyncSession, List[dict]], Awaitable[None]]] = None,
+) -> BulkResponse:
+    """
+    Insert or update records in one transaction with INSERT ... ON CONFLICT (key) DO UPDATE.
+
+    An update sets only the columns present in the record, so a partial
+    record leaves the other stored values alone; a new row gets the column
+    defaults for what it leaves out.
+
+    When a key appears more than once the last record wins and the earlier ones
+    are reported as duplicate, since one statement cannot update a row twice.
+    on_created runs inside the same transaction with the records that were new.
+    """
+    latest = {}
+    for index, record in enumerate(records):
+        latest[record[key.key]] = index
+    now = datetime.utcnow()
+    rows = []
+    for index, record in enumerate(records):
+        if latest[record[key.key]] == index:
+            rows.append({**record, "created_at": now, "updated_at": now})
+
+    keys = list(latest)
+    existing = set(await db.scalars(select(key).where(key.in_(keys)))) if keys else set()
+
+    if rows:
+        insert = insert_for(db)
+        # Records update only the columns they supply, so records with different
+        # column sets cannot share a statement: one statement per column set.
+        groups = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        for group in groups.values():
+            stmt = insert(model.__table__)
+            update_columns = [name for name in group[0] if name not in (key.key, "created_at")]
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key.key],
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+            # executemany: the driver batches the rows into multi-row statements.
+            await db.execute(stmt, group)
+        if on_created is not None:
+            await on_created(db, [row for row in rows if row[key.key] not in existing])
+        await db.commit()
+
+    results = []
+    for index, record in enumerate(records):
+        value = record[key.key]
+        if latest[value] != index:
+            status = "duplicate"
+        elif value in existing:
+            status = "updated"
+        else:
+            status = "created"
+        results.append(BulkItemResult(id=value, status=status))
+    return BulkResponse(
+        created=sum(1 for item in results if item.status == "created"),
+        updated=sum(1 for item in results if item.status == "updated"),
+        results=results,
+    )
@@ -0,0 +1,95 @@
+# changes.py
+import os
+from datetime import datetime, timedelta
+from typing import Generic, List, Optional, TypeVar, Union
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from db.model.tombstone import Tombstone
+from api.crud.pagination import decode_cursor, encode_cursor
+
+# Rows written in the last few seconds are held back for the next sync:
+# updated_at is taken when a statement runs, not when its transaction commits,
+# so a slower transaction can still commit a row older than one already served.
+CHANGES_SAFETY_LAG_SECONDS = float(os.getenv("CHANGES_SAFETY_LAG_SECONDS", "5"))
+
+T = TypeVar("T")
+
+
+class DeletedItem(BaseModel):
+    id: str
+    deleted_at: datetime
+
+
+class ChangesResponse(BaseModel, Generic[T]):
+    changes: List[T]
+    deleted: List[DeletedItem]
+    # Pass back as since= on the next call.
+    watermark: str
+    # More changes are ready now; call again with the new watermark.
+    has_more: bool
+
+
+def record_deletion(db: AsyncSession, model, resource_id: Union[str, int]) -> None:
+    """Add a tombstone for a deleted row; committed with the delete itself."""
+    db.add(Tombstone(resource=model.__tablename__, resource_id=str(resource_id)))
+
+
+def _decode_watermark(since: str):
+    value = decode_cursor(since, types=(dict,))
+    try:
+        updated_at = datetime.fromisoformat(value["t"]) if value["t"] is not None else None
+        last_key = value["k"]
+        last_tombstone = int(value["d"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid watermark")
+    return updated_at, last_key, last_tombstone
+
+
+async def changes_since(
+    db: AsyncSession,
+    model,
+    key: InstrumentedAttribute,
+    since: Optional[str] = None,
+    limit: int = 500,
+) -> dict:
+    """
+    Rows of model written after the since watermark, plus tombstones of rows deleted after it.
+
+    Rows come in (updated_at, key) order and the watermark records the last one
+    served, so paging through a burst of writes with the same updated_at neither
+    skips nor repeats rows. Without since this is a full sync.
+    """
+    updated_at, last_key, last_tombstone = (None, None, 0) if since is None else _decode_watermark(since)
+    upper = datetime.utcnow() - timedelta(seconds=CHANGES_SAFETY_LAG_SECONDS)
+
+    stmt = select(model).where(model.updated_at <= upper)
+    if updated_at is not None:
+        stmt = stmt.where(tuple_(model.updated_at, key) > tuple_(updated_at, last_key))
+    rows = list(await db.scalars(stmt.order_by(model.updated_at, key).limit(limit + 1)))
+
+    tombstones = list(await db.scalars(
+        select(Tombstone)
+        .where(Tombstone.resource == model.__tablename__, Tombstone.id > last_tombstone, Tombstone.deleted_at <= upper)
+        .order_by(Tombstone.id)
+        .limit(limit + 1)
+    ))
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        updated_at, last_key = rows[-1].updated_at, getattr(rows[-1], key.key)
+    if tombstones:
+        last_tombstone = tombstones[-1].id
+    watermark = encode_cursor({
+        "t": updated_at.isoformat() if updated_at is not None else None,
+        "k": last_key,
+        "d": last_tombstone,
+    })
+    return {
+        "changes": rows,
+        "deleted": [DeletedItem(id=t.resource_id, deleted_at=t.deleted_at) for t in tombstones],
+        "watermark": watermark,
+        "has_more": has_more,
+    }
@@ -0,0 +1,56 @@
+# etag.py
+import hashlib
+from typing import Iterable, Optional
+from fastapi import Request, Response
+
+
+def _etag(parts: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    # Weak: the tag follows the row versions, not the exact bytes sent.
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _version(row) -> str:
+    key = ":".join(str(value) for value in row.__mapper__.primary_key_from_instance(row))
+    return f"{key}@{row.updated_at.isoformat()}"
+
+
+def row_etag(row) -> str:
+    """ETag of one row, from its table, primary key and updated_at."""
+    return _etag([row.__tablename__, _version(row)])
+
+
+def list_etag(rows: list, variant: str = "") -> str:
+    """
+    ETag of a page of rows; adding, removing or updating any of them changes it.
+    variant tells apart different renderings of the same rows, such as fields= projections.
+    """
+    return _etag(["list", variant, *(f"{row.__tablename__}/{_version(row)}" for row in rows)])
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the ETag on response and return a 304 if the client already has this version.
+
+    The endpoint returns the 304 as is, which skips response model validation
+    and JSON encoding. Headers already set on response, such as X-Next-Cursor,
+    are carried over.
+    """
+    response.headers["ETag"] = etag
+    if not _matches(request.headers.get("if-none-match"), etag):
+        return None
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    return Response(status_code=304, headers=headers)
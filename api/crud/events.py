@@ -0,0 +1,165 @@
+# events.py
+import asyncio
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import List, Optional, Set
+from db.db_setup import async_engine
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber; a console that falls this far behind is
+# disconnected and resyncs from the list endpoints when it reconnects.
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+# Seconds between keep-alive comments on an idle stream.
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+# Postgres NOTIFY channel shared by all API workers.
+EVENT_CHANNEL = "api_events"
+
+# Tags NOTIFY payloads, so a worker skips the events it already delivered itself.
+_ORIGIN = uuid.uuid4().hex
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(event: dict) -> str:
+    return json.dumps(event, default=_json_default)
+
+
+def row_data(row) -> dict:
+    return {column.key: getattr(row, column.key) for column in row.__mapper__.column_attrs}
+
+
+def row_event(kind: str, data: dict, company_id=None, station_id=None) -> dict:
+    """Event for a created row; the owner ids are what subscribers filter on."""
+    return {
+        "type": kind,
+        "company_id": None if company_id is None else str(company_id),
+        "station_id": None if station_id is None else str(station_id),
+        "data": data,
+    }
+
+
+@dataclass(eq=False)
+class Subscription:
+    company_id: Optional[str] = None
+    station_id: Optional[str] = None
+    # None is queued when the subscription is dropped.
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(EVENT_QUEUE_SIZE))
+
+    def matches(self, event: dict) -> bool:
+        if self.company_id is not None and event["company_id"] != self.company_id:
+            return False
+        if self.station_id is not None and event["station_id"] != self.station_id:
+            return False
+        return True
+
+
+class EventBroker:
+    """In-process fan-out of events to the open streams of this worker."""
+
+    def __init__(self):
+        self._subscriptions: Set[Subscription] = set()
+
+    def subscribe(self, company_id: Optional[str] = None, station_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(company_id, station_id)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def deliver(self, event: dict) -> None:
+        for subscription in list(self._subscriptions):
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Never block a write on a slow reader: drop its backlog and end its stream.
+                self.unsubscribe(subscription)
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscriptions),
+            "listening": _listener is not None,
+        }
+
+
+broker = EventBroker()
+
+# asyncpg connection that LISTENs on EVENT_CHANNEL and also sends this
+# worker's NOTIFYs; set only while run_listener is connected (Postgres).
+_listener = None
+_listener_lock = asyncio.Lock()
+
+
+async def publish(events: List[dict]) -> None:
+    """
+    Deliver events to this worker's streams and, on Postgres, NOTIFY the others.
+
+    Called after the write has committed. A failed NOTIFY is logged and does
+    not fail the request that made the write.
+    """
+    for event in events:
+        broker.deliver(event)
+    if _listener is None or not events:
+        return
+    payloads = [dumps({"origin": _ORIGIN, **event}) for event in events]
+    try:
+        async with _listener_lock:
+            await _listener.execute(
+                "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                EVENT_CHANNEL,
+                payloads,
+            )
+    except Exception:
+        logger.exception("Could not NOTIFY %d events", len(payloads))
+
+
+def _on_notify(connection, pid, channel, payload) -> None:
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        return
+    if event.pop("origin", None) != _ORIGIN:
+        broker.deliver(event)
+
+
+async def run_listener(retry_delay: float = 5.0) -> None:
+    """LISTEN for events published by other workers until cancelled; no-op off Postgres."""
+    global _listener
+    if async_engine.dialect.name != "postgresql":
+        return
+    import asyncpg
+
+    dsn = async_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            lost = asyncio.get_running_loop().create_future()
+            connection.add_termination_listener(lambda _: lost.done() or lost.set_result(None))
+            await connection.add_listener(EVENT_CHANNEL, _on_notify)
+            _listener = connection
+            await lost
+            logger.warning("Event listener connection lost, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Event listener failed, retrying in %ss", retry_delay)
+        finally:
+            _listener = None
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
@@ -0,0 +1,50 @@
+# export.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, List
+from sqlalchemy import Select
+from db.db_setup import AsyncSessionLocal
+
+# Rows fetched per round trip from the server-side cursor. Memory use is
+# bounded by one batch no matter how many rows the export covers.
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+async def export_rows(stmt: Select, columns: List[str], fmt: str) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of stmt as NDJSON or CSV, one encoded chunk per fetched batch.
+
+    The session is opened here rather than taken from get_async_db, because the
+    request dependencies are closed before a StreamingResponse body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue().encode("utf-8")
+            async for rows in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue().encode("utf-8")
+        else:
+            async for rows in result.partitions():
+                chunk = "".join(
+                    json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows
+                )
+                yield chunk.encode("utf-8")
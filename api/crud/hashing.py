@@ -0,0 +1,68 @@
+# hashing.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import bcrypt
+
+# bcrypt cost factor for new hashes; existing hashes keep the cost they were made with.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Processes per API worker that do the hashing, off the event loop and off the GIL.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+# Hash/check jobs admitted at once (running plus queued) per API worker.
+BCRYPT_MAX_CONCURRENCY = int(os.getenv("BCRYPT_MAX_CONCURRENCY", str(BCRYPT_WORKERS * 4)))
+# How long a request waits for an admission slot before it is turned away.
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", "5"))
+
+
+class HashingBusyError(Exception):
+    """All password hashing slots stayed busy for BCRYPT_QUEUE_TIMEOUT seconds."""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_slots = asyncio.Semaphore(BCRYPT_MAX_CONCURRENCY)
+
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that already runs an event loop and
+        # driver threads is not safe.
+        _executor = ProcessPoolExecutor(max_workers=BCRYPT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run(fn, *args):
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=BCRYPT_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HashingBusyError()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    hashed = await _run(_hashpw, password.encode("utf-8"), BCRYPT_ROUNDS)
+    return hashed.decode("utf-8")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run(_checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
@@ -0,0 +1,36 @@
+# jobs.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(
+    job: Callable[[], Awaitable[object]],
+    interval: float,
+    wake: Optional[asyncio.Event] = None,
+    debounce: float = 1.0,
+) -> None:
+    """
+    Run job every interval seconds until cancelled.
+
+    Setting wake runs it early; the debounce delay lets a burst of writes
+    collapse into a single run and is the least time between woken runs.
+    A failing run is logged and retried on the next tick rather than
+    stopping the loop.
+    """
+    while True:
+        try:
+            await job()
+        except Exception:
+            logger.exception("Background job %s failed", getattr(job, "__name__", job))
+        if wake is None:
+            await asyncio.sleep(interval)
+            continue
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            continue
+        await asyncio.sleep(debounce)
+        wake.clear()
@@ -0,0 +1,55 @@
+# menu_cache.py
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.model.role import RoleList
+from db.model.menuitem import MenuItem
+
+# Safety net for writes made by other worker processes, which cannot reach
+# this process' invalidate() calls.
+MENU_CACHE_TTL = float(os.getenv("MENU_CACHE_TTL", "60"))
+
+_MENU_COLUMNS = [column.key for column in MenuItem.__table__.columns if column.key not in ("created_at", "updated_at")]
+
+_trees: Dict[str, Tuple[float, List[dict]]] = {}
+# Bumped by every invalidation, so a load that raced with a write is not cached.
+_generation = 0
+
+
+def invalidate(role_id: Optional[str] = None) -> None:
+    """Drop the cached tree of one role, or of every role when role_id is None."""
+    global _generation
+    _generation += 1
+    if role_id is None:
+        _trees.clear()
+    else:
+        _trees.pop(role_id, None)
+
+
+async def get_role_menu(db: AsyncSession, role_id: str) -> Optional[List[dict]]:
+    """
+    Menu items of a role in RoleList.menuitems order, with their nested children.
+
+    Served from memory after the first call; the database is read again only
+    after a role/menu item write in this process or after MENU_CACHE_TTL.
+    Returns None if the role does not exist.
+    """
+    cached = _trees.get(role_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    generation = _generation
+    role = await db.scalar(select(RoleList).where(RoleList.id == role_id))
+    if role is None:
+        return None
+    menu_ids = role.menuitems or []
+    items = {}
+    if menu_ids:
+        for item in await db.scalars(select(MenuItem).where(MenuItem.menuID.in_(menu_ids))):
+            items[item.menuID] = {key: getattr(item, key) for key in _MENU_COLUMNS}
+    tree = [items[menu_id] for menu_id in menu_ids if menu_id in items]
+    if generation == _generation:
+        _trees[role_id] = (time.monotonic() + MENU_CACHE_TTL, tree)
+    return tree
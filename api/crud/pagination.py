@@ -0,0 +1,115 @@
+# pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import Select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(value: Any) -> str:
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple = (str, int)) -> Any:
+    """
+    Return the value stored in a cursor, raising ValueError if it was not
+    produced by encode_cursor or does not hold one of types.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(value, types) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def _decode_sorted_cursor(cursor: str, sort: InstrumentedAttribute, key: InstrumentedAttribute) -> Tuple[Any, Any]:
+    value = decode_cursor(cursor, types=(list,))
+    if len(value) != 2:
+        raise ValueError("Invalid cursor")
+    sort_value, key_value = value
+    if sort_value is not None:
+        if sort.type.python_type is datetime:
+            if not isinstance(sort_value, str):
+                raise ValueError("Invalid cursor")
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, sort.type.python_type) or isinstance(sort_value, bool):
+            raise ValueError("Invalid cursor")
+    if not isinstance(key_value, key.type.python_type) or isinstance(key_value, bool):
+        raise ValueError("Invalid cursor")
+    return sort_value, key_value
+
+
+async def keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    key: InstrumentedAttribute,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    skip: int = 0,
+    sort: Optional[InstrumentedAttribute] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Page through stmt ordered by key (a unique column, normally the primary key).
+
+    With a cursor the page starts right after the last row of the previous one, so
+    the database seeks through the key index instead of counting skipped rows.
+    skip is only honoured without a cursor, for clients still using offsets.
+
+    With sort the order is (sort, key) instead, NULL sort values last, and the
+    cursor holds both values; an index on (filter column, sort) then serves the
+    filter and the order of a filtered list together.
+    """
+    if sort is not None:
+        return await _sorted_page(db, stmt, sort, key, cursor, limit, skip)
+    if cursor is not None:
+        # A cursor of another resource must not reach the driver as a mismatched bind.
+        stmt = stmt.where(key > decode_cursor(cursor, types=(key.type.python_type,)))
+    elif skip:
+        stmt = stmt.offset(skip)
+    # One extra row tells whether another page exists without a COUNT query.
+    rows = list(await db.scalars(stmt.order_by(key).limit(limit + 1)))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key.key))
+    return rows, next_cursor
+
+
+async def _sorted_page(
+    db: AsyncSession,
+    stmt: Select,
+    sort: InstrumentedAttribute,
+    key: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+    skip: int,
+) -> Tuple[List[Any], Optional[str]]:
+    page, sort_value = stmt, None
+    if cursor is not None:
+        sort_value, key_value = _decode_sorted_cursor(cursor, sort, key)
+        if sort_value is None:
+            page = stmt.where(sort.is_(None), key > key_value)
+        else:
+            # sort >= value is the index range; the OR only filters rows of the cursor's own sort value.
+            page = stmt.where(sort >= sort_value, or_(sort > sort_value, key > key_value))
+    elif skip:
+        page = stmt.offset(skip)
+    rows = list(await db.scalars(page.order_by(sort.asc().nulls_last(), key).limit(limit + 1)))
+    if sort_value is not None and len(rows) <= limit:
+        # The range above ends at the last non-NULL value; NULL rows follow it.
+        rows += list(await db.scalars(stmt.where(sort.is_(None)).order_by(key).limit(limit + 1 - len(rows))))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = getattr(rows[-1], sort.key)
+        next_cursor = encode_cursor([
+            last.isoformat() if isinstance(last, datetime) else last,
+            getattr(rows[-1], key.key),
+        ])
+    return rows, next_cursor
@@ -0,0 +1,34 @@
+# projection.py
+from typing import List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Validate a comma-separated fields= value against a response model.
+
+    Returns the requested names in order, or None (all fields) when fields is
+    empty. Raises ValueError naming any field the model does not have.
+    """
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return selected or None
+
+
+def project(stmt: Select, entity, fields: Optional[List[str]]) -> Select:
+    """
+    Load only the selected columns of entity, plus its primary key (for keyset
+    cursors) and updated_at (for ETags). Other attributes raise on access
+    rather than being lazy-loaded one row at a time.
+    """
+    if not fields:
+        return stmt
+    mapper = entity.__mapper__
+    names = dict.fromkeys([*fields, *(column.key for column in mapper.primary_key), "updated_at"])
+    return stmt.options(load_only(*(getattr(entity, name) for name in names), raiseload=True))
@@ -0,0 +1,117 @@
+# repository.py
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from api.crud.bulk import bulk_upsert, BulkResponse
+from api.crud.changes import changes_since, record_deletion
+from api.crud.pagination import keyset_page
+from api.crud.projection import project
+
+ModelT = TypeVar("ModelT")
+
+
+def update_returning(model, condition, values: dict):
+    """
+    UPDATE ... RETURNING the whole row, replacing the SELECT, UPDATE and refresh
+    round trips of a load-modify-commit cycle. updated_at is set explicitly so it
+    moves on every write, including one with no other changed columns.
+    """
+    return (
+        update(model)
+        .where(condition)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(model)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+
+
+class Repository(Generic[ModelT]):
+    """
+    get/list/changes/create/update/delete/bulk for one model, keyed by a unique
+    column (id, CompanyId, VehicleId, menuID or Id).
+
+    Statements whose shape never changes are built once here with a bound
+    :key parameter, so each call skips statement construction and hits
+    SQLAlchemy's compiled cache. Writes are single INSERT/UPDATE/DELETE ...
+    RETURNING statements instead of load-modify-flush cycles, and lists are
+    keyset pages on the key column.
+
+    on_change runs after every committed write with the key written, or None
+    after a bulk upsert; resources use it to invalidate caches.
+    """
+
+    def __init__(
+        self,
+        model,
+        key: InstrumentedAttribute,
+        on_change: Optional[Callable[[Optional[Any]], None]] = None,
+    ):
+        self.model = model
+        self.key = key
+        self.on_change = on_change
+        self._select = select(model)
+        self._get = select(model).where(key == bindparam("key"))
+        self._insert = insert(model).returning(model)
+        self._delete = (
+            delete(model)
+            .where(key == bindparam("key"))
+            .returning(key)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _changed(self, key_value: Optional[Any]) -> None:
+        if self.on_change is not None:
+            self.on_change(key_value)
+
+    async def get(self, db: AsyncSession, key_value: Any) -> Optional[ModelT]:
+        return await db.scalar(self._get, {"key": key_value})
+
+    async def list(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        where: tuple = (),
+        sort: Optional[InstrumentedAttribute] = None,
+    ) -> Tuple[List[ModelT], Optional[str]]:
+        if fields and sort is not None:
+            # The cursor needs the sort value of the last row.
+            fields = [*fields, sort.key]
+        stmt = project(self._select, self.model, fields)
+        if where:
+            stmt = stmt.where(*where)
+        return await keyset_page(db, stmt, self.key, cursor, limit, skip, sort=sort)
+
+    async def changes(self, db: AsyncSession, since: Optional[str] = None, limit: int = 500) -> dict:
+        return await changes_since(db, self.model, self.key, since, limit)
+
+    async def create(self, db: AsyncSession, values: dict) -> ModelT:
+        row = await db.scalar(self._insert.values(**values))
+        await db.commit()
+        self._changed(getattr(row, self.key.key))
+        return row
+
+    async def update(self, db: AsyncSession, key_value: Any, values: dict) -> Optional[ModelT]:
+        row = await db.scalar(update_returning(self.model, self.key == key_value, values))
+        await db.commit()
+        self._changed(key_value)
+        return row
+
+    async def delete(self, db: AsyncSession, key_value: Any) -> bool:
+        deleted = await db.scalar(self._delete, {"key": key_value})
+        if deleted is None:
+            await db.rollback()
+            return False
+        record_deletion(db, self.model, deleted)
+        await db.commit()
+        self._changed(key_value)
+        return True
+
+    async def bulk_upsert(self, db: AsyncSession, records: List[dict], on_created=None) -> BulkResponse:
+        result = await bulk_upsert(db, self.model, self.key, records, on_created=on_created)
+        self._changed(None)
+        return result
@@ -0,0 +1,124 @@
+# summary_refresh.py
+import asyncio
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, String, bindparam, cast, delete, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert
+from db.db_setup import AsyncSessionLocal
+from db.model.dispatcher import Dispatcher
+from db.model.station import StationItem
+from db.model.station_summary import StationSummary
+from db.model.tombstone import Tombstone
+from db.model.transfer import TransfersDispatcher
+
+STATION_SUMMARY_REFRESH_SECONDS = float(os.getenv("STATION_SUMMARY_REFRESH_SECONDS", "60"))
+# Transfer activity folded into each dispatcher entry covers this trailing window.
+STATION_SUMMARY_WINDOW_HOURS = float(os.getenv("STATION_SUMMARY_WINDOW_HOURS", "24"))
+# Writes wake the refresh early, but never more often than this: each run
+# rebuilds every summary, so a steady stream of writes must not pin it.
+STATION_SUMMARY_MIN_INTERVAL_SECONDS = float(os.getenv("STATION_SUMMARY_MIN_INTERVAL_SECONDS", "10"))
+# pg advisory lock id, so only one worker process refreshes at a time.
+_REFRESH_LOCK_ID = 7_301_001
+
+# Set by the CRUD layer when stations or dispatchers change.
+dirty = asyncio.Event()
+
+# Station columns copied verbatim; supplyId and accountId have no source
+# column and stay whatever was stored by hand.
+_STATION_COLUMNS = ["id", "name", "address", "taxOffice", "taxNumber", "lat", "lng", "phone", "order", "city", "PumperId", "CompanyId", "status"]
+
+
+def mark_dirty() -> None:
+    dirty.set()
+
+
+def _refresh_statement(since: datetime, now: datetime):
+    transfers = TransfersDispatcher
+    activity = (
+        select(
+            transfers.DispatcherId.label("dispatcher_id"),
+            func.count().label("transfer_count"),
+            func.sum(transfers.BatchTotal).label("volume"),
+            func.max(transfers.DateRealized).label("last_transfer"),
+        )
+        .where(transfers.DateRealized >= since)
+        .group_by(transfers.DispatcherId)
+        .subquery()
+    )
+    # Keys are inlined: json_build_object takes "any", so bound keys would
+    # leave asyncpg unable to infer their parameter types.
+    dispatcher_entry = func.json_build_object(*[
+        part
+        for key, value in [
+            ("id", Dispatcher.id),
+            ("DispatcherName", Dispatcher.DispatcherName),
+            ("IMEI", Dispatcher.IMEI),
+            ("isActive", Dispatcher.isActive),
+            ("GrandTotal", Dispatcher.GrandTotal),
+            ("LastUpdateDate", Dispatcher.LastUpdateDate),
+            ("PumpModel", Dispatcher.PumpModel),
+            ("TransferCount", func.coalesce(activity.c.transfer_count, 0)),
+            ("Volume", func.coalesce(activity.c.volume, 0)),
+            ("LastTransfer", activity.c.last_transfer),
+        ]
+        for part in (literal_column(f"'{key}'"), value)
+    ])
+    dispatchers = (
+        select(
+            Dispatcher.StationId.label("station_id"),
+            func.json_agg(aggregate_order_by(dispatcher_entry, Dispatcher.id)).label("dispatchers"),
+        )
+        .select_from(Dispatcher)
+        .outerjoin(activity, activity.c.dispatcher_id == cast(Dispatcher.id, String))
+        .where(Dispatcher.StationId.isnot(None))
+        .group_by(Dispatcher.StationId)
+        .subquery()
+    )
+    source = (
+        select(
+            *[getattr(StationItem, name) for name in _STATION_COLUMNS],
+            func.coalesce(dispatchers.c.dispatchers, literal_column("'[]'::json")),
+            bindparam("created_at", now, type_=DateTime),
+            bindparam("updated_at", now, type_=DateTime),
+        )
+        .select_from(StationItem)
+        .outerjoin(dispatchers, cast(dispatchers.c.station_id, String) == StationItem.id)
+    )
+    stmt = insert(StationSummary).from_select([*_STATION_COLUMNS, "Dispatchers", "created_at", "updated_at"], source)
+    changed = [getattr(StationSummary, name).is_distinct_from(stmt.excluded[name]) for name in _STATION_COLUMNS[1:]]
+    changed.append(cast(StationSummary.Dispatchers, JSONB).is_distinct_from(cast(stmt.excluded["Dispatchers"], JSONB)))
+    # Rows whose content did not change are left alone, so their updated_at
+    # (and anything keyed on it) stays put.
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={name: stmt.excluded[name] for name in [*_STATION_COLUMNS[1:], "Dispatchers", "updated_at"]},
+        where=or_(*changed),
+    )
+
+
+async def refresh_station_summaries() -> int:
+    """
+    Rebuild station_summaries from stations, dispatchers and recent transfers.
+
+    One INSERT ... SELECT ... ON CONFLICT DO UPDATE writes only the summaries
+    whose content changed, and summaries of deleted stations are removed, all
+    in one transaction; readers keep seeing the previous rows until it commits.
+    Returns the number of summaries written, or -1 if another worker holds
+    the refresh lock. Needs Postgres (json_agg, advisory locks).
+    """
+    now = datetime.utcnow()
+    since = now - timedelta(hours=STATION_SUMMARY_WINDOW_HOURS)
+    async with AsyncSessionLocal() as db:
+        if db.get_bind().dialect.name != "postgresql":
+            return 0
+        if not await db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_ID))):
+            return -1
+        result = await db.execute(_refresh_statement(since, now))
+        orphaned = StationSummary.id.not_in(select(StationItem.id))
+        await db.execute(insert(Tombstone).from_select(
+            ["resource", "resource_id", "deleted_at"],
+            select(literal(StationSummary.__tablename__), StationSummary.id, literal(now, DateTime)).where(orphaned),
+        ))
+        await db.execute(delete(StationSummary).where(orphaned))
+        await db.commit()
+        return result.rowcount
@@ -0,0 +1,205 @@
+# vehicle_limits.py
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import AsyncSessionLocal
+from db.model.transfer import TransfersDispatcher
+from db.model.vehicle import Vehicle
+
+# What happens to a created transfer that takes its vehicle over MonthLimit:
+# "reject" refuses it, "flag" stores it with LimitExceeded set, "off" skips
+# usage tracking altogether. Bulk uploads record transfers that already
+# happened at the pump, so they are flagged in reject mode too.
+VEHICLE_LIMIT_MODE = os.getenv("VEHICLE_LIMIT_MODE", "flag").lower()
+VEHICLE_ROLLOVER_CHECK_SECONDS = float(os.getenv("VEHICLE_ROLLOVER_CHECK_SECONDS", "3600"))
+
+
+class LimitExceededError(Exception):
+    def __init__(self, vehicle_id: str, limit: float, usage: float):
+        super().__init__(f"Monthly limit of vehicle {vehicle_id} exceeded ({usage} > {limit})")
+        self.vehicle_id = vehicle_id
+        self.limit = limit
+        self.usage = usage
+
+
+def month_start(value: Optional[datetime] = None) -> datetime:
+    value = value or datetime.utcnow()
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _charge_statement():
+    vehicles = Vehicle.__table__
+    month = bindparam("v_month")
+    current = or_(vehicles.c.UsageMonth.is_(None), vehicles.c.UsageMonth == month)
+    # Usage of an older month restarts from this batch; transfers dated in a
+    # month the vehicle has already left only count towards Totaltransfer.
+    return (
+        update(vehicles)
+        .where(vehicles.c.VehicleId == bindparam("v_id"))
+        .values(
+            MontTransfer=case(
+                (current, func.coalesce(vehicles.c.MontTransfer, 0) + bindparam("v_month_amount")),
+                (vehicles.c.UsageMonth < month, bindparam("v_month_amount")),
+                else_=vehicles.c.MontTransfer,
+            ),
+            Totaltransfer=func.coalesce(vehicles.c.Totaltransfer, 0) + bindparam("v_amount"),
+            UsageMonth=case((vehicles.c.UsageMonth > month, vehicles.c.UsageMonth), else_=month),
+            updated_at=bindparam("v_now"),
+        )
+    )
+
+
+def _reverse_statement():
+    vehicles = Vehicle.__table__
+    # MontTransfer only gives back transfers of the month it is counting.
+    return (
+        update(vehicles)
+        .where(vehicles.c.VehicleId == bindparam("v_id"))
+        .values(
+            MontTransfer=case(
+                (vehicles.c.UsageMonth == bindparam("v_month"), func.coalesce(vehicles.c.MontTransfer, 0) - bindparam("v_amount")),
+                else_=vehicles.c.MontTransfer,
+            ),
+            Totaltransfer=func.coalesce(vehicles.c.Totaltransfer, 0) - bindparam("v_amount"),
+            updated_at=bindparam("v_now"),
+        )
+    )
+
+
+async def reverse_transfers(db: AsyncSession, transfers: List[dict]) -> None:
+    """
+    Take the BatchTotal of transfers back off their vehicles' usage: deleted
+    transfers, and the previous values of updated ones before the new values
+    are charged. Runs in the caller's transaction, one executemany UPDATE.
+    """
+    if VEHICLE_LIMIT_MODE == "off":
+        return
+    amounts: Dict[tuple, float] = {}
+    for transfer in transfers:
+        if not transfer.get("VehicleId") or not transfer.get("BatchTotal"):
+            continue
+        key = (transfer["VehicleId"], month_start(transfer.get("DateRealized")))
+        amounts[key] = amounts.get(key, 0.0) + transfer["BatchTotal"]
+    if not amounts:
+        return
+    now = datetime.utcnow()
+    await db.execute(_reverse_statement(), [
+        {"v_id": vehicle_id, "v_month": month, "v_amount": amount, "v_now": now}
+        for (vehicle_id, month), amount in amounts.items()
+    ])
+
+
+async def charge_transfers(db: AsyncSession, transfers: List[dict]) -> Dict[str, LimitExceededError]:
+    """
+    Add the BatchTotal of newly created transfers (or the new values of
+    updated ones) to their vehicles' usage and return the transfers that went
+    over MonthLimit, by id.
+
+    Runs in the caller's transaction: one executemany UPDATE covering every
+    vehicle in the batch, then one SELECT of the new usage. The updated rows
+    stay locked until the caller commits, so concurrent creates for the same
+    vehicle queue up instead of losing increments.
+    """
+    if VEHICLE_LIMIT_MODE == "off":
+        return {}
+    charges: Dict[str, dict] = {}
+    for transfer in transfers:
+        if not transfer.get("VehicleId") or not transfer.get("BatchTotal"):
+            continue
+        month = month_start(transfer.get("DateRealized"))
+        charge = charges.setdefault(transfer["VehicleId"], {"month": month, "month_amount": 0.0, "amount": 0.0, "transfers": []})
+        charge["amount"] += transfer["BatchTotal"]
+        charge["transfers"].append((month, transfer))
+        if month > charge["month"]:
+            charge["month"], charge["month_amount"] = month, 0.0
+        if month == charge["month"]:
+            charge["month_amount"] += transfer["BatchTotal"]
+    if not charges:
+        return {}
+
+    now = datetime.utcnow()
+    await db.execute(_charge_statement(), [
+        {"v_id": vehicle_id, "v_month": charge["month"], "v_month_amount": charge["month_amount"], "v_amount": charge["amount"], "v_now": now}
+        for vehicle_id, charge in charges.items()
+    ])
+    usage = await db.execute(
+        select(Vehicle.VehicleId, Vehicle.MontTransfer, Vehicle.MonthLimit, Vehicle.UsageMonth)
+        .where(Vehicle.VehicleId.in_(charges))
+    )
+
+    exceeded = {}
+    for vehicle_id, month_usage, month_limit, usage_month in usage:
+        charge = charges[vehicle_id]
+        if month_limit is None or usage_month != charge["month"]:
+            continue
+        # Replay the batch in order to find the first transfer over the limit.
+        running = (month_usage or 0.0) - charge["month_amount"]
+        for month, transfer in charge["transfers"]:
+            if month != charge["month"]:
+                continue
+            running += transfer["BatchTotal"]
+            if running > month_limit:
+                exceeded[transfer["id"]] = LimitExceededError(vehicle_id, month_limit, running)
+    return exceeded
+
+
+async def clear_limit_flags(db: AsyncSession, transfers: List[dict]) -> None:
+    """
+    Clear LimitExceeded on every transfer of the (vehicle, month) pairs of
+    transfers whose usage is back within MonthLimit, after a reverse or a
+    re-charge lowered it. Only the month a vehicle is counting is known, so
+    older months keep their flags. Runs in the caller's transaction; each
+    UPDATE is a range on ix_transfers_vehicle_date.
+    """
+    if VEHICLE_LIMIT_MODE == "off":
+        return
+    months = {
+        (transfer["VehicleId"], month_start(transfer.get("DateRealized")))
+        for transfer in transfers if transfer.get("VehicleId")
+    }
+    if not months:
+        return
+    usage = await db.execute(
+        select(Vehicle.VehicleId, Vehicle.MontTransfer, Vehicle.MonthLimit, Vehicle.UsageMonth)
+        .where(Vehicle.VehicleId.in_({vehicle_id for vehicle_id, _ in months}))
+    )
+    within = {
+        (vehicle_id, usage_month)
+        for vehicle_id, month_usage, month_limit, usage_month in usage
+        if month_limit is None or (month_usage or 0.0) <= month_limit
+    }
+    for vehicle_id, month in months & within:
+        await db.execute(
+            update(TransfersDispatcher)
+            .where(
+                TransfersDispatcher.VehicleId == vehicle_id,
+                TransfersDispatcher.DateRealized >= month,
+                TransfersDispatcher.DateRealized < month_start(month + timedelta(days=32)),
+                TransfersDispatcher.LimitExceeded.is_(True),
+            )
+            .values(LimitExceeded=False)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def rollover_vehicle_months() -> int:
+    """
+    Start the new month for every vehicle still counting an older one, in one
+    set-based UPDATE. Vehicles without a UsageMonth keep their MontTransfer and
+    are stamped with the current month.
+    """
+    month = month_start()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(Vehicle.__table__)
+            .where(or_(Vehicle.UsageMonth.is_(None), Vehicle.UsageMonth < month))
+            .values(
+                MontTransfer=case((Vehicle.UsageMonth.is_(None), Vehicle.MontTransfer), else_=0),
+                UsageMonth=month,
+                updated_at=datetime.utcnow(),
+            )
+        )
+        await db.commit()
+        return result.rowcount
@@ -1,12 +1,17 @@
 # api/dispatchers/dispatchers.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_dispatchers, get_dispatcher, create_dispatcher, update_dispatcher, delete_dispatcher
-from ...models.dispatcher import Dispatcher
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import dispatcher_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from api.crud.bulk import BulkResponse, BULK_MAX_RECORDS
+from db.model.dispatcher import Dispatcher
+from routes.auth import verify_token
 from datetime import datetime
 
 router = APIRouter(prefix="/dispatchers", tags=["dispatchers"])
@@ -42,60 +47,108 @@ class DispatcherResponse(DispatcherBase):
         from_attributes = True
 
 @router.get("/", response_model=List[DispatcherResponse])
-def get_dispatchers_list(
+async def get_dispatchers_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_dispatchers(db, skip, limit)
+    try:
+        selected = parse_fields(fields, DispatcherResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await dispatcher_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, DispatcherResponse, selected)
 
 @router.post("/", response_model=DispatcherResponse)
-def create_dispatcher_endpoint(
+async def create_dispatcher_endpoint(
     dispatcher: DispatcherCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_dispatcher = create_dispatcher(db, dispatcher.dict())
+    db_dispatcher = await dispatcher_repo.create(db, dispatcher.dict())
     return db_dispatcher
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_dispatchers_endpoint(
+    dispatchers: List[DispatcherCreate],
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    if len(dispatchers) > BULK_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_RECORDS} records per request")
+    return await dispatcher_repo.bulk_upsert(db, [dispatcher.dict(exclude_unset=True) for dispatcher in dispatchers])
+
+@router.get("/changes", response_model=ChangesResponse[DispatcherResponse])
+async def get_dispatcher_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await dispatcher_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=DispatcherResponse)
-def get_dispatcher_endpoint(
+async def get_dispatcher_endpoint(
     id: int,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_dispatcher = get_dispatcher(db, id)
+    db_dispatcher = await dispatcher_repo.get(db, id)
     if not db_dispatcher:
         raise HTTPException(status_code=404, detail="Dispatcher not found")
+    cached = not_modified(request, response, row_etag(db_dispatcher))
+    if cached:
+        return cached
     return db_dispatcher
 
 @router.put("/{id}", response_model=DispatcherResponse)
-def update_dispatcher_endpoint(
+async def update_dispatcher_endpoint(
     id: int,
     dispatcher: DispatcherUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_dispatcher = update_dispatcher(db, id, dispatcher.dict(exclude_unset=True))
+    db_dispatcher = await dispatcher_repo.update(db, id, dispatcher.dict(exclude_unset=True))
     if not db_dispatcher:
         raise HTTPException(status_code=404, detail="Dispatcher not found")
     return db_dispatcher
 
 @router.delete("/{id}", response_model=dict)
-def delete_dispatcher_endpoint(
+async def delete_dispatcher_endpoint(
     id: int,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_dispatcher(db, id):
+    if not await dispatcher_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Dispatcher not found")
     return {"message": "Dispatcher deleted"}
\ No newline at end of file
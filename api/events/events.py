@@ -0,0 +1,44 @@
+# api/events/events.py
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from api.crud.events import broker, dumps, EVENT_HEARTBEAT_SECONDS
+from routes.auth import verify_token
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+async def _event_stream(company_id: Optional[str], station_id: Optional[str]):
+    # Subscribed here rather than in the endpoint: a client that disconnects
+    # before the body starts never runs this, so there is nothing to leak.
+    subscription = broker.subscribe(company_id, station_id)
+    try:
+        # Sent first so clients know the stream is live before any event arrives.
+        yield b": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+            if event is None:
+                # Fell too far behind; the client reconnects and resyncs.
+                yield b"event: overflow\ndata: {}\n\n"
+                return
+            yield f"event: {event['type']}\ndata: {dumps(event)}\n\n".encode("utf-8")
+    finally:
+        broker.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_events(
+    company_id: Optional[str] = Query(None),
+    station_id: Optional[str] = Query(None),
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return StreamingResponse(
+        _event_stream(company_id, station_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,14 @@
 # api/menuitems/menuitems.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from db.db_setup import get_db
-from api.crud import get_menuitems, get_menuitem, create_menuitem, update_menuitem, delete_menuitem
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import menuitem_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
 from db.model.menuitem import MenuItem
 from routes.auth import verify_token
 
@@ -34,60 +38,96 @@ class MenuItemResponse(MenuItemBase):
         from_attributes = True
 
 @router.get("/", response_model=List[MenuItemResponse])
-def get_menuitems_list(
+async def get_menuitems_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_menuitems(db, skip, limit)
+    try:
+        selected = parse_fields(fields, MenuItemResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await menuitem_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, MenuItemResponse, selected)
 
 @router.post("/", response_model=MenuItemResponse)
-def create_menuitem_endpoint(
+async def create_menuitem_endpoint(
     menuitem: MenuItemCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_menuitem = create_menuitem(db, menuitem.dict())
+    db_menuitem = await menuitem_repo.create(db, menuitem.dict())
     return db_menuitem
 
+@router.get("/changes", response_model=ChangesResponse[MenuItemResponse])
+async def get_menuitem_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await menuitem_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{menuID}", response_model=MenuItemResponse)
-def get_menuitem_endpoint(
+async def get_menuitem_endpoint(
     menuID: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_menuitem = get_menuitem(db, menuID)
+    db_menuitem = await menuitem_repo.get(db, menuID)
     if not db_menuitem:
         raise HTTPException(status_code=404, detail="MenuItem not found")
+    cached = not_modified(request, response, row_etag(db_menuitem))
+    if cached:
+        return cached
     return db_menuitem
 
 @router.put("/{menuID}", response_model=MenuItemResponse)
-def update_menuitem_endpoint(
+async def update_menuitem_endpoint(
     menuID: str,
     menuitem: MenuItemUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_menuitem = update_menuitem(db, menuID, menuitem.dict(exclude_unset=True))
+    db_menuitem = await menuitem_repo.update(db, menuID, menuitem.dict(exclude_unset=True))
     if not db_menuitem:
         raise HTTPException(status_code=404, detail="MenuItem not found")
     return db_menuitem
 
 @router.delete("/{menuID}", response_model=dict)
-def delete_menuitem_endpoint(
+async def delete_menuitem_endpoint(
     menuID: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_menuitem(db, menuID):
+    if not await menuitem_repo.delete(db, menuID):
         raise HTTPException(status_code=404, detail="MenuItem not found")
     return {"message": "MenuItem deleted"}
\ No newline at end of file
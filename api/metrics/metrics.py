@@ -0,0 +1,52 @@
+# api/metrics/metrics.py
+import os
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from db.db_setup import engine, async_engine
+from db.pool_stats import pool_status
+from middleware.metrics import render
+
+# Prometheus scrapers do not log in, so /metrics asks for this bearer token
+# instead. Without a token it answers 404: route templates, pool state and
+# timings are not for the public app. METRICS_PUBLIC=true serves it with no
+# token, for deployments where only an internal network reaches the port.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() in ("1", "true", "yes")
+
+router = APIRouter(tags=["metrics"])
+
+
+def _pool_lines() -> List[str]:
+    gauges = {
+        "db_pool_size": ("Configured pool size.", "size"),
+        "db_pool_checked_out": ("Connections currently in use.", "checked_out"),
+        "db_pool_overflow": ("Connections open above the pool size.", "overflow"),
+    }
+    pools = {"async": pool_status(async_engine.pool), "sync": pool_status(engine.pool)}
+    lines = []
+    for name, (help, key) in gauges.items():
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{pool="{pool}"}} {status[key]}' for pool, status in pools.items() if key in status]
+    lines += [
+        "# HELP db_pool_checkouts_total Connections handed out by the pool.",
+        "# TYPE db_pool_checkouts_total counter",
+    ]
+    lines += [f'db_pool_checkouts_total{{pool="{pool}"}} {status["wait"]["checkouts"]}' for pool, status in pools.items() if "wait" in status]
+    lines += [
+        "# HELP db_pool_wait_seconds_total Time spent waiting for (or opening) pooled connections.",
+        "# TYPE db_pool_wait_seconds_total counter",
+    ]
+    lines += [f'db_pool_wait_seconds_total{{pool="{pool}"}} {status["wait"]["total_seconds"]}' for pool, status in pools.items() if "wait" in status]
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        if not METRICS_PUBLIC:
+            raise HTTPException(status_code=404, detail="Not Found")
+    elif not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render(_pool_lines()), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,10 +1,16 @@
 # api/notifications/notifications.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from db.db_setup import get_db
-from crud.crud import get_notifications, get_notification, create_notification, update_notification, delete_notification
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import notification_repo, notifications_export_query, notification_filters, notification_sort
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from api.crud.export import export_rows, EXPORT_MEDIA_TYPES
 from db.model.notification import Notification
 from routes.auth import verify_token
 from datetime import datetime
@@ -35,60 +41,136 @@ class NotificationResponse(NotificationBase):
         from_attributes = True
 
 @router.get("/", response_model=List[NotificationResponse])
-def get_notifications_list(
+async def get_notifications_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    company_id: Optional[int] = Query(None),
+    station_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="transfer_create_date lower bound (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="transfer_create_date upper bound (exclusive)"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_notifications(db, skip, limit)
+    try:
+        selected = parse_fields(fields, NotificationResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    filters = dict(
+        company_id=company_id,
+        station_id=station_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        items, next_cursor = await notification_repo.list(
+            db, skip, limit, cursor,
+            fields=selected,
+            where=notification_filters(**filters),
+            sort=notification_sort(**filters),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, NotificationResponse, selected)
+
+@router.get("/export")
+async def export_notifications(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    company_id: Optional[int] = Query(None),
+    station_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="transfer_create_date lower bound (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="transfer_create_date upper bound (exclusive)"),
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    columns = ["id", *NotificationBase.model_fields]
+    stmt = notifications_export_query(
+        columns,
+        company_id=company_id,
+        station_id=station_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return StreamingResponse(
+        export_rows(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="notifications.{format}"'},
+    )
 
 @router.post("/", response_model=NotificationResponse)
-def create_notification_endpoint(
+async def create_notification_endpoint(
     notification: NotificationCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_notification = create_notification(db, notification.dict())
+    db_notification = await notification_repo.create(db, notification.dict())
     return db_notification
 
+@router.get("/changes", response_model=ChangesResponse[NotificationResponse])
+async def get_notification_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await notification_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=NotificationResponse)
-def get_notification_endpoint(
+async def get_notification_endpoint(
     id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_notification = get_notification(db, id)
+    db_notification = await notification_repo.get(db, id)
     if not db_notification:
         raise HTTPException(status_code=404, detail="Notification not found")
+    cached = not_modified(request, response, row_etag(db_notification))
+    if cached:
+        return cached
     return db_notification
 
 @router.put("/{id}", response_model=NotificationResponse)
-def update_notification_endpoint(
+async def update_notification_endpoint(
     id: str,
     notification: NotificationUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_notification = update_notification(db, id, notification.dict(exclude_unset=True))
+    db_notification = await notification_repo.update(db, id, notification.dict(exclude_unset=True))
     if not db_notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     return db_notification
 
 @router.delete("/{id}", response_model=dict)
-def delete_notification_endpoint(
+async def delete_notification_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_notification(db, id):
+    if not await notification_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Notification not found")
     return {"message": "Notification deleted"}
\ No newline at end of file
@@ -1,12 +1,17 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db.db_setup import get_db
-from ...db.model.role import RoleList 
-from ...api.crud import get_roles, get_role, create_role, update_role, delete_role
-from ...db.db_setup import get_db
-from ...routes.auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from db.model.role import RoleList
+from api.crud.async_crud import role_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from api.crud.menu_cache import get_role_menu
+from api.menuItems.menuitems import MenuItemResponse
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
@@ -27,60 +32,107 @@ class RoleResponse(RoleBase):
         from_attributes = True
 
 @router.get("/", response_model=List[RoleResponse])
-def get_roles_list(
+async def get_roles_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_roles(db, skip, limit)
+    try:
+        selected = parse_fields(fields, RoleResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await role_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, RoleResponse, selected)
 
 @router.post("/", response_model=RoleResponse)
-def create_role_endpoint(
+async def create_role_endpoint(
     role: RoleCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_role = create_role(db, role.dict())
+    db_role = await role_repo.create(db, role.dict())
     return db_role
 
+@router.get("/changes", response_model=ChangesResponse[RoleResponse])
+async def get_role_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await role_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=RoleResponse)
-def get_role_endpoint(
+async def get_role_endpoint(
     id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_role = get_role(db, id)
+    db_role = await role_repo.get(db, id)
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
+    cached = not_modified(request, response, row_etag(db_role))
+    if cached:
+        return cached
     return db_role
 
+@router.get("/{id}/menu", response_model=List[MenuItemResponse])
+async def get_role_menu_endpoint(
+    id: str,
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    menu = await get_role_menu(db, id)
+    if menu is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return menu
+
 @router.put("/{id}", response_model=RoleResponse)
-def update_role_endpoint(
+async def update_role_endpoint(
     id: str,
     role: RoleUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_role = update_role(db, id, role.dict(exclude_unset=True))
+    db_role = await role_repo.update(db, id, role.dict(exclude_unset=True))
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
     return db_role
 
 @router.delete("/{id}", response_model=dict)
-def delete_role_endpoint(
+async def delete_role_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_role(db, id):
+    if not await role_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Role not found")
     return {"message": "Role deleted"}
\ No newline at end of file
@@ -1,12 +1,17 @@
 # api/station_summaries/station_summaries.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_station_summaries, get_station_summary, create_station_summary, update_station_summary, delete_station_summary
-from ...models.station_summary import StationSummary
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.summary_refresh import refresh_station_summaries
+from api.crud.async_crud import station_summary_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from db.model.station_summary import StationSummary
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/station-summaries", tags=["station_summaries"])
 
@@ -40,60 +45,107 @@ class StationSummaryResponse(StationSummaryBase):
         from_attributes = True
 
 @router.get("/", response_model=List[StationSummaryResponse])
-def get_station_summaries_list(
+async def get_station_summaries_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_station_summaries(db, skip, limit)
+    try:
+        selected = parse_fields(fields, StationSummaryResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await station_summary_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, StationSummaryResponse, selected)
 
 @router.post("/", response_model=StationSummaryResponse)
-def create_station_summary_endpoint(
+async def create_station_summary_endpoint(
     summary: StationSummaryCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_summary = create_station_summary(db, summary.dict())
+    db_summary = await station_summary_repo.create(db, summary.dict())
     return db_summary
 
+@router.post("/refresh", response_model=dict)
+async def refresh_station_summaries_endpoint(
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    written = await refresh_station_summaries()
+    if written < 0:
+        raise HTTPException(status_code=409, detail="A refresh is already running")
+    return {"message": "Station summaries refreshed", "updated": written}
+
+@router.get("/changes", response_model=ChangesResponse[StationSummaryResponse])
+async def get_station_summary_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await station_summary_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=StationSummaryResponse)
-def get_station_summary_endpoint(
+async def get_station_summary_endpoint(
     id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_summary = get_station_summary(db, id)
+    db_summary = await station_summary_repo.get(db, id)
     if not db_summary:
         raise HTTPException(status_code=404, detail="Station summary not found")
+    cached = not_modified(request, response, row_etag(db_summary))
+    if cached:
+        return cached
     return db_summary
 
 @router.put("/{id}", response_model=StationSummaryResponse)
-def update_station_summary_endpoint(
+async def update_station_summary_endpoint(
     id: str,
     summary: StationSummaryUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_summary = update_station_summary(db, id, summary.dict(exclude_unset=True))
+    db_summary = await station_summary_repo.update(db, id, summary.dict(exclude_unset=True))
     if not db_summary:
         raise HTTPException(status_code=404, detail="Station summary not found")
     return db_summary
 
 @router.delete("/{id}", response_model=dict)
-def delete_station_summary_endpoint(
+async def delete_station_summary_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_station_summary(db, id):
+    if not await station_summary_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Station summary not found")
     return {"message": "Station summary deleted"}
\ No newline at end of file
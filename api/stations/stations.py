@@ -1,12 +1,16 @@
 # api/stations/stations.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_stations, get_station, create_station, update_station, delete_station
-from ...models.station import StationItem
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import station_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from db.model.station import StationItem
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/stations", tags=["stations"])
 
@@ -37,60 +41,96 @@ class StationResponse(StationBase):
         from_attributes = True
 
 @router.get("/", response_model=List[StationResponse])
-def get_stations_list(
+async def get_stations_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_stations(db, skip, limit)
+    try:
+        selected = parse_fields(fields, StationResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await station_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, StationResponse, selected)
 
 @router.post("/", response_model=StationResponse)
-def create_station_endpoint(
+async def create_station_endpoint(
     station: StationCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_station = create_station(db, station.dict())
+    db_station = await station_repo.create(db, station.dict())
     return db_station
 
+@router.get("/changes", response_model=ChangesResponse[StationResponse])
+async def get_station_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await station_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=StationResponse)
-def get_station_endpoint(
+async def get_station_endpoint(
     id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_station = get_station(db, id)
+    db_station = await station_repo.get(db, id)
     if not db_station:
         raise HTTPException(status_code=404, detail="Station not found")
+    cached = not_modified(request, response, row_etag(db_station))
+    if cached:
+        return cached
     return db_station
 
 @router.put("/{id}", response_model=StationResponse)
-def update_station_endpoint(
+async def update_station_endpoint(
     id: str,
     station: StationUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_station = update_station(db, id, station.dict(exclude_unset=True))
+    db_station = await station_repo.update(db, id, station.dict(exclude_unset=True))
     if not db_station:
         raise HTTPException(status_code=404, detail="Station not found")
     return db_station
 
 @router.delete("/{id}", response_model=dict)
-def delete_station_endpoint(
+async def delete_station_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_station(db, id):
+    if not await station_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Station not found")
     return {"message": "Station deleted"}
\ No newline at end of file
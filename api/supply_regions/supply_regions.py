@@ -1,12 +1,16 @@
 # api/supply_regions/supply_regions.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_supply_regions, get_supply_region, create_supply_region, update_supply_region, delete_supply_region
-from ...models.supply_region import SupplyRegion
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import supply_region_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from db.model.supply_region import SupplyRegion
+from routes.auth import verify_token
 
 router = APIRouter(prefix="/supply-regions", tags=["supply_regions"])
 
@@ -26,60 +30,96 @@ class SupplyRegionResponse(SupplyRegionBase):
         from_attributes = True
 
 @router.get("/", response_model=List[SupplyRegionResponse])
-def get_supply_regions_list(
+async def get_supply_regions_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_supply_regions(db, skip, limit)
+    try:
+        selected = parse_fields(fields, SupplyRegionResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await supply_region_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, SupplyRegionResponse, selected)
 
 @router.post("/", response_model=SupplyRegionResponse)
-def create_supply_region_endpoint(
+async def create_supply_region_endpoint(
     region: SupplyRegionCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_region = create_supply_region(db, region.dict())
+    db_region = await supply_region_repo.create(db, region.dict())
     return db_region
 
+@router.get("/changes", response_model=ChangesResponse[SupplyRegionResponse])
+async def get_supply_region_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await supply_region_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{Id}", response_model=SupplyRegionResponse)
-def get_supply_region_endpoint(
+async def get_supply_region_endpoint(
     Id: int,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_region = get_supply_region(db, Id)
+    db_region = await supply_region_repo.get(db, Id)
     if not db_region:
         raise HTTPException(status_code=404, detail="Supply region not found")
+    cached = not_modified(request, response, row_etag(db_region))
+    if cached:
+        return cached
     return db_region
 
 @router.put("/{Id}", response_model=SupplyRegionResponse)
-def update_supply_region_endpoint(
+async def update_supply_region_endpoint(
     Id: int,
     region: SupplyRegionUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_region = update_supply_region(db, Id, region.dict(exclude_unset=True))
+    db_region = await supply_region_repo.update(db, Id, region.dict(exclude_unset=True))
     if not db_region:
         raise HTTPException(status_code=404, detail="Supply region not found")
     return db_region
 
 @router.delete("/{Id}", response_model=dict)
-def delete_supply_region_endpoint(
+async def delete_supply_region_endpoint(
     Id: int,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_supply_region(db, Id):
+    if not await supply_region_repo.delete(db, Id):
         raise HTTPException(status_code=404, detail="Supply region not found")
     return {"message": "Supply region deleted"}
\ No newline at end of file
@@ -0,0 +1,35 @@
+# api/system/system.py
+from fastapi import APIRouter, Depends, HTTPException
+from db.db_setup import engine, async_engine
+from db.pool_stats import pool_status
+from api.crud.events import broker
+from routes.auth import verify_token, token_cache
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+@router.get("/pool", response_model=dict)
+async def get_pool_stats(
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return {
+        "async": pool_status(async_engine.pool),
+        "sync": pool_status(engine.pool),
+    }
+
+@router.get("/token-cache", response_model=dict)
+async def get_token_cache_stats(
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return token_cache.stats()
+
+@router.get("/events", response_model=dict)
+async def get_event_stats(
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return broker.stats()
@@ -1,12 +1,20 @@
 # api/transfers/transfers.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_transfers, get_transfer, create_transfer, update_transfer, delete_transfer
-from ...models.transfer import TransfersDispatcher
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import transfer_repo, transfers_export_query, transfer_filters, transfer_sort
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from api.crud.bulk import BulkResponse, BULK_MAX_RECORDS
+from api.crud.export import export_rows, EXPORT_MEDIA_TYPES
+from api.crud.vehicle_limits import LimitExceededError
+from db.model.transfer import TransfersDispatcher
+from routes.auth import verify_token
 from datetime import datetime
 
 router = APIRouter(prefix="/transfers", tags=["transfers"])
@@ -32,65 +40,168 @@ class TransferUpdate(TransferBase):
 
 class TransferResponse(TransferBase):
     id: str
+    LimitExceeded: Optional[bool] = None
 
     class Config:
         from_attributes = True
 
 @router.get("/", response_model=List[TransferResponse])
-def get_transfers_list(
+async def get_transfers_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    company_id: Optional[str] = Query(None),
+    dispatcher_id: Optional[str] = Query(None),
+    vehicle_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="DateRealized lower bound (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="DateRealized upper bound (exclusive)"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_transfers(db, skip, limit)
+    try:
+        selected = parse_fields(fields, TransferResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    filters = dict(
+        company_id=company_id,
+        dispatcher_id=dispatcher_id,
+        vehicle_id=vehicle_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        items, next_cursor = await transfer_repo.list(
+            db, skip, limit, cursor,
+            fields=selected,
+            where=transfer_filters(**filters),
+            sort=transfer_sort(**filters),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, TransferResponse, selected)
+
+@router.get("/export")
+async def export_transfers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    company_id: Optional[str] = Query(None),
+    dispatcher_id: Optional[str] = Query(None),
+    vehicle_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="DateRealized lower bound (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="DateRealized upper bound (exclusive)"),
+    current_user: dict = Depends(verify_token)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    columns = ["id", *TransferBase.model_fields]
+    stmt = transfers_export_query(
+        columns,
+        company_id=company_id,
+        dispatcher_id=dispatcher_id,
+        vehicle_id=vehicle_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return StreamingResponse(
+        export_rows(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transfers.{format}"'},
+    )
 
 @router.post("/", response_model=TransferResponse)
-def create_transfer_endpoint(
+async def create_transfer_endpoint(
     transfer: TransferCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_transfer = create_transfer(db, transfer.dict())
+    try:
+        db_transfer = await transfer_repo.create(db, transfer.dict())
+    except LimitExceededError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     return db_transfer
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_transfers_endpoint(
+    transfers: List[TransferCreate],
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    if len(transfers) > BULK_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_RECORDS} records per request")
+    return await transfer_repo.bulk_upsert(db, [transfer.dict(exclude_unset=True) for transfer in transfers])
+
+@router.get("/changes", response_model=ChangesResponse[TransferResponse])
+async def get_transfer_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await transfer_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=TransferResponse)
-def get_transfer_endpoint(
+async def get_transfer_endpoint(
     id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_transfer = get_transfer(db, id)
+    db_transfer = await transfer_repo.get(db, id)
     if not db_transfer:
         raise HTTPException(status_code=404, detail="Transfer not found")
+    cached = not_modified(request, response, row_etag(db_transfer))
+    if cached:
+        return cached
     return db_transfer
 
 @router.put("/{id}", response_model=TransferResponse)
-def update_transfer_endpoint(
+async def update_transfer_endpoint(
     id: str,
     transfer: TransferUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_transfer = update_transfer(db, id, transfer.dict(exclude_unset=True))
+    try:
+        db_transfer = await transfer_repo.update(db, id, transfer.dict(exclude_unset=True))
+    except LimitExceededError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     if not db_transfer:
         raise HTTPException(status_code=404, detail="Transfer not found")
     return db_transfer
 
 @router.delete("/{id}", response_model=dict)
-def delete_transfer_endpoint(
+async def delete_transfer_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_transfer(db, id):
+    if not await transfer_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="Transfer not found")
     return {"message": "Transfer deleted"}
\ No newline at end of file
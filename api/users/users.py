@@ -1,11 +1,17 @@
 
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from db.db_setup import get_db
-from api.crud.crud import get_users, get_user, create_user, update_user, delete_user
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import user_repo
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
 from db.model.user import User as UserModel
+from api.crud.hashing import HashingBusyError
 from routes.auth import verify_token
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -34,63 +40,105 @@ class UserResponse(UserBase):
         from_attributes = True
 
 @router.get("/", response_model=List[UserResponse])
-def get_users_list(
+async def get_users_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_users(db, skip, limit)
+    try:
+        selected = parse_fields(fields, UserResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await user_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, UserResponse, selected)
 
 @router.post("/", response_model=UserResponse)
-def create_user_endpoint(
+async def create_user_endpoint(
     user: UserCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     user_data = user.dict()
     user_data["id"] = str(uuid.uuid4())  # Generate unique ID
-    db_user = create_user(db, user_data)
+    try:
+        db_user = await user_repo.create(db, user_data)
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail="Password hashing is busy, try again", headers={"Retry-After": "1"})
     return db_user
 
+@router.get("/changes", response_model=ChangesResponse[UserResponse])
+async def get_user_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await user_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{id}", response_model=UserResponse)
-def get_user_endpoint(
+async def get_user_endpoint(
+    request: Request,
+    response: Response,
     id: str = Path(..., description="The ID of the user to get"),
     q: Optional[str] = Query(None, min_length=3, max_length=50, description="Query string for searching users"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_user = get_user(db, id)
+    db_user = await user_repo.get(db, id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    cached = not_modified(request, response, row_etag(db_user))
+    if cached:
+        return cached
     return db_user
 
 @router.put("/{id}", response_model=UserResponse)
-def update_user_endpoint(
+async def update_user_endpoint(
     id: str,
     user: UserUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_user = update_user(db, id, user.dict(exclude_unset=True))
+    try:
+        db_user = await user_repo.update(db, id, user.dict(exclude_unset=True))
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail="Password hashing is busy, try again", headers={"Retry-After": "1"})
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
 @router.delete("/{id}", response_model=dict)
-def delete_user_endpoint(
+async def delete_user_endpoint(
     id: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_user(db, id):
+    if not await user_repo.delete(db, id):
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User deleted"}
\ No newline at end of file
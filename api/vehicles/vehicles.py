@@ -1,12 +1,18 @@
 # api/vehicles/vehicles.py
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ...db_setup import get_db
-from ...crud import get_vehicles, get_vehicle, create_vehicle, update_vehicle, delete_vehicle
-from ...models.vehicle import Vehicle
-from ..auth import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.db_setup import get_async_db
+from api.crud.async_crud import vehicle_repo, get_vehicle_usage
+from api.crud.changes import ChangesResponse
+from api.crud.etag import not_modified, row_etag, list_etag
+from api.crud.serialization import json_rows
+from api.crud.projection import parse_fields
+from api.crud.bulk import BulkResponse, BULK_MAX_RECORDS
+from db.model.vehicle import Vehicle
+from routes.auth import verify_token
+from datetime import datetime
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
@@ -29,65 +35,132 @@ class VehicleUpdate(VehicleBase):
 
 class VehicleResponse(VehicleBase):
     VehicleId: str
+    UsageMonth: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 @router.get("/", response_model=List[VehicleResponse])
-def get_vehicles_list(
+async def get_vehicles_list(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    return get_vehicles(db, skip, limit)
+    try:
+        selected = parse_fields(fields, VehicleResponse)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        items, next_cursor = await vehicle_repo.list(db, skip, limit, cursor, fields=selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    cached = not_modified(request, response, list_etag(items, ",".join(selected or [])))
+    if cached:
+        return cached
+    return json_rows(response, items, VehicleResponse, selected)
 
 @router.post("/", response_model=VehicleResponse)
-def create_vehicle_endpoint(
+async def create_vehicle_endpoint(
     vehicle: VehicleCreate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_vehicle = create_vehicle(db, vehicle.dict())
+    db_vehicle = await vehicle_repo.create(db, vehicle.dict())
     return db_vehicle
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_vehicles_endpoint(
+    vehicles: List[VehicleCreate],
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    if len(vehicles) > BULK_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_RECORDS} records per request")
+    return await vehicle_repo.bulk_upsert(db, [vehicle.dict(exclude_unset=True) for vehicle in vehicles])
+
+@router.get("/changes", response_model=ChangesResponse[VehicleResponse])
+async def get_vehicle_changes_endpoint(
+    since: Optional[str] = Query(None, description="watermark from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await vehicle_repo.changes(db, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
 @router.get("/{VehicleId}", response_model=VehicleResponse)
-def get_vehicle_endpoint(
+async def get_vehicle_endpoint(
     VehicleId: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_vehicle = get_vehicle(db, VehicleId)
+    db_vehicle = await vehicle_repo.get(db, VehicleId)
     if not db_vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
+    cached = not_modified(request, response, row_etag(db_vehicle))
+    if cached:
+        return cached
     return db_vehicle
 
+class VehicleUsageResponse(BaseModel):
+    VehicleId: str
+    month: datetime
+    MonthLimit: Optional[float] = None
+    usage: float
+    remaining: Optional[float] = None
+
+@router.get("/{VehicleId}/usage", response_model=VehicleUsageResponse)
+async def get_vehicle_usage_endpoint(
+    VehicleId: str,
+    current_user: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    usage = await get_vehicle_usage(db, VehicleId)
+    if not usage:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return usage
+
 @router.put("/{VehicleId}", response_model=VehicleResponse)
-def update_vehicle_endpoint(
+async def update_vehicle_endpoint(
     VehicleId: str,
     vehicle: VehicleUpdate,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    db_vehicle = update_vehicle(db, VehicleId, vehicle.dict(exclude_unset=True))
+    db_vehicle = await vehicle_repo.update(db, VehicleId, vehicle.dict(exclude_unset=True))
     if not db_vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     return db_vehicle
 
 @router.delete("/{VehicleId}", response_model=dict)
-def delete_vehicle_endpoint(
+async def delete_vehicle_endpoint(
     VehicleId: str,
     current_user: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
-    if not delete_vehicle(db, VehicleId):
+    if not await vehicle_repo.delete(db, VehicleId):
         raise HTTPException(status_code=404, detail="Vehicle not found")
     return {"message": "Vehicle deleted"}
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Load test of the API as main.create_app() builds it: latency percentiles and
+throughput of list, get, create and bulk requests at a fixed concurrency.
+
+Seeds stations, dispatchers, vehicles and transfers (10k / 50k / 3k / 10M
+by default; --scale shrinks all but vehicles) into DATABASE_URL, or into a
+SQLite file in the temp directory that is kept between runs. Seeding resumes
+from the rows already present, so only the first run pays for it. Requests go through
+httpx's in-process ASGI transport: the numbers cover routing, auth,
+validation, SQL and encoding, not the network.
+
+    python -m benchmarks.api_bench --scale 0.01 --requests 200
+    python -m benchmarks.api_bench --scenarios list_transfers get_transfer --concurrency 32
+    python -m benchmarks.api_bench --save before.json
+    python -m benchmarks.api_bench --baseline before.json --tolerance 0.15   # exit 1 on regression or new errors
+
+A 10M-transfer SQLite seed takes a while; use Postgres or --scale for quick runs.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "api_bench.db")
+
+import httpx
+from sqlalchemy import func, insert, select
+from db.db_setup import Base, SessionLocal, async_engine, engine
+from db.model.dispatcher import Dispatcher
+from db.model.station import StationItem
+from db.model.transfer import TransfersDispatcher
+from db.model.vehicle import Vehicle
+from db.model.user import Role
+from main import create_app
+from routes.auth import create_token
+
+STATIONS = 10_000
+DISPATCHERS = 50_000
+TRANSFERS = 10_000_000
+COMPANIES = 40
+VEHICLES = 3_000
+SEED_BATCH = 20_000
+SEED_START = datetime(2025, 1, 1)
+BULK_SIZE = 500
+
+
+def _station(i: int, rng: random.Random) -> dict:
+    return {
+        "id": str(i),
+        "name": f"Station {i}",
+        "address": f"{rng.randint(1, 300)} Industrial Zone",
+        "lat": rng.uniform(36, 42),
+        "lng": rng.uniform(26, 45),
+        "status": rng.choice(["active", "passive"]),
+        "city": rng.choice(["Istanbul", "Ankara", "Izmir", "Bursa"]),
+        "CompanyId": f"C{i % COMPANIES + 1}",
+    }
+
+
+def _dispatcher(i: int, rng: random.Random, stations: int) -> dict:
+    return {
+        "id": i,
+        "IMEI": str(rng.randint(10**14, 10**15 - 1)),
+        "StationId": i % stations + 1,
+        "DispatcherName": f"Pump {i}",
+        "GrandTotal": rng.uniform(0, 10**6),
+        "isActive": 1,
+        "PumpModel": rng.randint(1, 4),
+        "CompanyId": f"C{i % COMPANIES + 1}",
+    }
+
+
+def _vehicle(i: int, rng: random.Random) -> dict:
+    return {
+        "VehicleId": f"V{i}",
+        "Company": f"C{i % COMPANIES + 1}",
+        "CardName": f"Card {i}",
+        # High enough that creates are not flagged; the check itself still runs.
+        "MonthLimit": 10**9,
+        "IsActive": True,
+    }
+
+
+def _transfer(i: int, rng: random.Random, dispatchers: int, total: int) -> dict:
+    return {
+        "id": f"T{i:09d}",
+        "OID": i,
+        "CompanyId": f"C{rng.randint(1, COMPANIES)}",
+        "DispatcherId": str(rng.randint(1, dispatchers)),
+        "VehicleId": f"V{rng.randint(1, VEHICLES)}",
+        "Status": rng.choice(["done", "pending"]),
+        # Spread over the last ~year, oldest first, like production inserts.
+        "DateRealized": SEED_START + timedelta(seconds=i * 31_536_000 // max(total, 1)),
+        "CreateDate": i,
+        "GrandTotalStart": rng.uniform(0, 10**6),
+        "BatchTotal": rng.uniform(1, 80),
+        "Type": "fuel",
+        "BatchPrice": rng.uniform(40, 4000),
+    }
+
+
+def seed(stations: int, dispatchers: int, transfers: int) -> None:
+    # The whole schema: create/bulk paths also touch vehicles, tombstones and friends.
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    plan = [
+        (StationItem, stations, lambda i, rng: _station(i, rng)),
+        (Dispatcher, dispatchers, lambda i, rng: _dispatcher(i, rng, stations)),
+        (Vehicle, VEHICLES, _vehicle),
+        (TransfersDispatcher, transfers, lambda i, rng: _transfer(i, rng, dispatchers, transfers)),
+    ]
+    with SessionLocal() as db:
+        for model, target, make in plan:
+            present = db.scalar(select(func.count()).select_from(model))
+            if present >= target:
+                continue
+            # Seeded per batch, so a resumed seed produces the same rows.
+            started = time.perf_counter()
+            for offset in range(present, target, SEED_BATCH):
+                rng = random.Random(offset)
+                rows = [
+                    {**make(i, rng), "created_at": now, "updated_at": now}
+                    for i in range(offset + 1, min(offset + SEED_BATCH, target) + 1)
+                ]
+                db.execute(insert(model), rows)
+                db.commit()
+                print(f"\rseeding {model.__tablename__}: {offset + len(rows):,}/{target:,}", end="", file=sys.stderr)
+            print(f" ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+
+def _base36(number: int) -> str:
+    digits = ""
+    while number:
+        number, digit = divmod(number, 36)
+        digits = "0123456789abcdefghijklmnopqrstuvwxyz"[digit] + digits
+    return digits or "0"
+
+
+class _Admin:
+    id = "bench"
+    email = "bench@example.com"
+    role = Role.admin
+    roleID = "1"
+    displayName = "Benchmark"
+
+
+def scenarios(stations: int, transfers: int, rng: random.Random) -> dict:
+    """name -> function returning (method, url, json body) for the next request."""
+    # Unique across runs and within String(10): "N" + 9 base36 digits of (run start, counter).
+    created = itertools.count((int(time.time()) % 10**8) * 10**6)
+
+    def new_transfer() -> dict:
+        return {
+            "id": "N" + _base36(next(created)).rjust(9, "0"),
+            "CompanyId": f"C{rng.randint(1, COMPANIES)}",
+            "DispatcherId": str(rng.randint(1, 100)),
+            "VehicleId": f"V{rng.randint(1, VEHICLES)}",
+            "Status": "done",
+            "DateRealized": datetime.utcnow().isoformat(),
+            "BatchTotal": rng.uniform(1, 80),
+            "Type": "fuel",
+            "BatchPrice": rng.uniform(40, 4000),
+        }
+
+    recent = (SEED_START + timedelta(days=330)).isoformat()
+    return {
+        "list_stations": lambda: ("GET", "/api/stations/?limit=100", None),
+        "list_dispatchers": lambda: ("GET", "/api/dispatchers/?limit=100", None),
+        "list_transfers": lambda: (
+            "GET", f"/api/transfers/?limit=100&company_id=C{rng.randint(1, COMPANIES)}&date_from={recent}", None,
+        ),
+        "get_station": lambda: ("GET", f"/api/stations/{rng.randint(1, stations)}", None),
+        "get_transfer": lambda: ("GET", f"/api/transfers/T{rng.randint(1, transfers):09d}", None),
+        "create_transfer": lambda: ("POST", "/api/transfers/", new_transfer()),
+        "bulk_transfers": lambda: ("POST", "/api/transfers/bulk", [new_transfer() for _ in range(BULK_SIZE)]),
+    }
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, requests: int, concurrency: int, warmup: int) -> dict:
+    async def call():
+        method, url, body = make_request()
+        started = time.perf_counter()
+        response = await client.request(method, url, json=body)
+        return time.perf_counter() - started, response.status_code
+
+    for _ in range(warmup):
+        await call()
+
+    latencies, errors = [], 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            seconds, status = await call()
+            latencies.append(seconds)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": _percentile(latencies, 0.50) * 1000,
+        "p95": _percentile(latencies, 0.95) * 1000,
+        "p99": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        # Fast failures would otherwise pass as a throughput gain.
+        if result["errors"] > before.get("errors", 0):
+            found.append(f"{name}: errors {before.get('errors', 0)} -> {result['errors']}")
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            found.append(f"{name}: {before['rps']:.1f} -> {result['rps']:.1f} req/s")
+        if result["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{name}: p95 {before['p95']:.1f} -> {result['p95']:.1f} ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the seeded volumes")
+    parser.add_argument("--scenarios", nargs="+", help="subset to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1453, help="random seed for request parameters")
+    parser.add_argument("--save", help="write results as JSON, for a later --baseline")
+    parser.add_argument("--baseline", help="JSON from --save to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed throughput / p95 drift before failing")
+    args = parser.parse_args()
+
+    stations = max(int(STATIONS * args.scale), 1)
+    dispatchers = max(int(DISPATCHERS * args.scale), 1)
+    transfers = max(int(TRANSFERS * args.scale), 1)
+    seed(stations, dispatchers, transfers)
+
+    available = scenarios(stations, transfers, random.Random(args.seed))
+    names = args.scenarios or list(available)
+    unknown = set(names) - set(available)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(available)})")
+
+    async def run_all() -> dict:
+        results = {}
+        # Server errors come back as 500s and are counted, rather than aborting the run.
+        transport = httpx.ASGITransport(app=create_app(), raise_app_exceptions=False)
+        headers = {"Authorization": f"Bearer {create_token(_Admin)}"}
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+                print(f"{stations:,} stations, {dispatchers:,} dispatchers, {transfers:,} transfers; concurrency {args.concurrency}")
+                print(f"{'scenario':>18} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+                for name in names:
+                    result = await run_scenario(client, available[name], args.requests, args.concurrency, args.warmup)
+                    results[name] = result
+                    print(
+                        f"{name:>18} {result['rps']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+                        f"{result['p99']:>8.1f} {result['errors']:>7}"
+                    )
+        finally:
+            # Pooled async connections belong to this loop; close them before it ends.
+            await async_engine.dispose()
+        return results
+
+    results = asyncio.run(run_all())
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"database": engine.url.get_backend_name(), "concurrency": args.concurrency, "results": results}, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file)["results"], args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
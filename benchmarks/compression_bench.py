@@ -0,0 +1,87 @@
+"""
+Bytes saved and CPU cost of response compression, per payload size.
+
+Payloads are JSON pages shaped like /api/station-summaries/ (each row with a
+nested Dispatchers list), run through the same encoders CompressionMiddleware
+uses. Needs no database:
+
+    python -m benchmarks.compression_bench
+    python -m benchmarks.compression_bench --rows 10 100 1000 --repeat 20
+"""
+import argparse
+import json
+import random
+import time
+from middleware.compression import _Brotli, _Gzip, brotli
+
+
+def station_summary(index: int, rng: random.Random) -> dict:
+    return {
+        "id": f"S{index:05d}",
+        "supplyId": rng.randint(1, 50),
+        "accountId": rng.randint(1, 50),
+        "name": f"Station {index}",
+        "address": f"{rng.randint(1, 300)} Industrial Zone, Block {rng.choice('ABCDEF')}",
+        "taxOffice": rng.choice(["Kadikoy", "Besiktas", "Cankaya", "Konak"]),
+        "taxNumber": str(rng.randint(10**9, 10**10 - 1)),
+        "lat": round(rng.uniform(36, 42), 6),
+        "lng": round(rng.uniform(26, 45), 6),
+        "phone": f"+90 5{rng.randint(10, 59)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "order": index,
+        "city": rng.choice(["Istanbul", "Ankara", "Izmir", "Bursa"]),
+        "PumperId": rng.randint(1, 500),
+        "CompanyId": f"C{rng.randint(1, 40)}",
+        "status": rng.choice(["active", "passive"]),
+        "Dispatchers": [
+            {
+                "id": index * 10 + d,
+                "DispatcherName": f"Pump {d}",
+                "IMEI": str(rng.randint(10**14, 10**15 - 1)),
+                "isActive": 1,
+                "GrandTotal": round(rng.uniform(0, 10**6), 2),
+                "LastUpdateDate": "2026-10-18T08:%02d:00" % rng.randint(0, 59),
+                "PumpModel": rng.randint(1, 4),
+                "TransferCount": rng.randint(0, 400),
+                "Volume": round(rng.uniform(0, 20000), 2),
+                "LastTransfer": "2026-10-18T09:%02d:00" % rng.randint(0, 59),
+            }
+            for d in range(rng.randint(2, 6))
+        ],
+    }
+
+
+def measure(make_encoder, payload: bytes, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compressed = make_encoder().finish(payload)
+        best = min(best, time.perf_counter() - started)
+    return len(compressed), best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=10, help="runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    encoders = [(f"gzip-{level}", lambda level=level: _Gzip(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        encoders += [(f"br-{quality}", lambda quality=quality: _Brotli(quality)) for quality in (1, 4, 11)]
+    else:
+        print("brotli is not installed; only gzip is measured\n")
+
+    rng = random.Random(1453)
+    print(f"{'rows':>6} {'encoder':>8} {'raw bytes':>12} {'compressed':>12} {'saved':>7} {'ms':>9} {'MB/s':>8}")
+    for rows in args.rows:
+        payload = json.dumps([station_summary(i, rng) for i in range(rows)]).encode("utf-8")
+        for name, make_encoder in encoders:
+            size, seconds = measure(make_encoder, payload, args.repeat)
+            print(
+                f"{rows:>6} {name:>8} {len(payload):>12,} {size:>12,} "
+                f"{1 - size / len(payload):>7.1%} {seconds * 1000:>9.3f} {len(payload) / seconds / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Throughput of GET /api/transfers/?limit=1000 with the previous and the current JSON encoding.
+
+"previous" is the endpoint as it was: return the ORM rows and let FastAPI
+validate them through List[TransferResponse] and encode with the stdlib json
+JSONResponse. "current" encodes the same rows with json_rows (orjson, no
+per-row validation). Both run against the same seeded database through
+httpx's in-process ASGI transport, so the numbers exclude the network.
+
+Uses DATABASE_URL when set, otherwise a throwaway SQLite file:
+
+    python -m benchmarks.serialization_bench --rows 5000 --requests 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "serialization_bench.db")
+
+from typing import List
+from fastapi import Depends, FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
+from db.db_setup import Base, SessionLocal, async_engine, engine, get_async_db
+from db.model.transfer import TransfersDispatcher
+from api.crud.async_crud import transfer_repo
+from api.crud.serialization import json_rows
+from api.transfers.transfers import TransferResponse
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine, tables=[TransfersDispatcher.__table__])
+    with SessionLocal() as db:
+        present = db.scalar(select(func.count()).select_from(TransfersDispatcher))
+        if present >= rows:
+            return
+        rng = random.Random(1453)
+        start = datetime(2026, 1, 1)
+        now = datetime.utcnow()
+        db.execute(insert(TransfersDispatcher), [
+            {
+                "id": f"B{i:08d}",
+                "OID": i,
+                "CompanyId": f"C{rng.randint(1, 40)}",
+                "DispatcherId": str(rng.randint(1, 500)),
+                "VehicleId": f"V{rng.randint(1, 3000)}",
+                "Status": rng.choice(["done", "pending"]),
+                "DateRealized": start + timedelta(minutes=i),
+                "CreateDate": i,
+                "GrandTotalStart": rng.uniform(0, 10**6),
+                "BatchTotal": rng.uniform(1, 80),
+                "Type": "fuel",
+                "BatchPrice": rng.uniform(40, 4000),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(present, rows)
+        ])
+        db.commit()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/previous", response_model=List[TransferResponse], response_class=JSONResponse)
+    async def previous(limit: int = 1000, db: AsyncSession = Depends(get_async_db)):
+        items, _ = await transfer_repo.list(db, 0, limit)
+        return items
+
+    @app.get("/current", response_model=List[TransferResponse], response_class=ORJSONResponse)
+    async def current(response: Response, limit: int = 1000, db: AsyncSession = Depends(get_async_db)):
+        items, _ = await transfer_repo.list(db, 0, limit)
+        return json_rows(response, items, TransferResponse)
+
+    return app
+
+
+async def run(path: str, requests: int, concurrency: int, limit: int) -> dict:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(path, params={"limit": limit})
+        first.raise_for_status()
+        latencies = []
+        queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(path, params={"limit": limit})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "bytes": len(first.content),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="transfers to seed")
+    parser.add_argument("--limit", type=int, default=1000, help="page size requested")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    seed(args.rows)
+
+    async def compare():
+        # One event loop for both runs: pooled async connections are bound to it.
+        print(f"{'encoding':>10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>10}")
+        for name in ("previous", "current"):
+            result = await run(f"/{name}", args.requests, args.concurrency, args.limit)
+            print(f"{name:>10} {result['rps']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['bytes']:>10,}")
+        await async_engine.dispose()
+
+    asyncio.run(compare())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Worker boot time: a fresh interpreter importing main, building the app with
+create_app() and running the lifespan startup, as a uvicorn worker does.
+
+Each run is a new process, so nothing is cached between runs but the OS page
+cache. Also reports how many database connections were checked out during
+boot, which should be 0: engines connect on first use.
+
+    python -m benchmarks.startup_bench --runs 10
+    python -m benchmarks.startup_bench --imports 15    # slowest imports of main, via -X importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+built = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(boot())
+from db.pool_stats import TimedAsyncQueuePool, TimedQueuePool
+print(json.dumps({
+    "import": imported - started,
+    "create_app": built - imported,
+    "lifespan": ready - built,
+    "total": ready - started,
+    "routes": len(app.routes),
+    "connections": TimedQueuePool.wait_stats.count + TimedAsyncQueuePool.wait_stats.count,
+}))
+"""
+
+
+def probe(env: dict) -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, count: int) -> list:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented two spaces per level; keep what main imports directly.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=0, help="also list the N slowest modules main imports (routers load later, in create_app)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Boot must not need a reachable database; point at one that is never created.
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.devnull + ".startup_bench.db")
+    env.setdefault("PYTHONPATH", os.getcwd())
+
+    results = [probe(env) for _ in range(args.runs)]
+    print(f"{args.runs} runs, {results[0]['routes']} routes")
+    print(f"{'phase':>12} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for phase in ("import", "create_app", "lifespan", "total"):
+        values = [result[phase] * 1000 for result in results]
+        print(f"{phase:>12} {statistics.median(values):>10.1f} {min(values):>8.1f} {max(values):>8.1f}")
+    print(f"DB connections during boot: {max(result['connections'] for result in results)}")
+
+    if args.imports:
+        print(f"\n{'cumulative ms':>14}  module")
+        for micros, name in slowest_imports(env, args.imports):
+            print(f"{micros / 1000:>14.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# migration_ops.py
+from typing import List, Sequence, Tuple
+from alembic import op
+
+# (name, table, columns) of an index built by a migration.
+IndexSpec = Tuple[str, str, List[str]]
+
+
+def create_indexes_concurrently(indexes: Sequence[IndexSpec]) -> None:
+    """
+    Build indexes with CREATE INDEX CONCURRENTLY, so their tables stay writable
+    while they build. CONCURRENTLY cannot run inside a transaction, so the
+    statements run in an autocommit block after the migration's earlier work
+    has been committed. Indexes that already exist are skipped.
+    """
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def drop_indexes_concurrently(indexes: Sequence[IndexSpec]) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in indexes:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
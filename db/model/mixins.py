@@ -4,4 +4,5 @@ from datetime import datetime
 
 class Timestamp:
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    # Indexed for the changes feeds, which read rows in updated_at order.
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
\ No newline at end of file
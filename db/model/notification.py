@@ -1,10 +1,16 @@
 # models/notification.py
-from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
 from .mixins import Timestamp
 from ..db_setup import Base
 
 class Notification(Timestamp, Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # The list and export filter on one owner column plus a transfer_create_date range.
+        Index("ix_notifications_company_date", "company_id", "transfer_create_date"),
+        Index("ix_notifications_station_date", "station_id", "transfer_create_date"),
+        Index("ix_notifications_date", "transfer_create_date"),
+    )
 
     id = Column(String(50), primary_key=True, index=True)
     company_id = Column(Integer, nullable=True)
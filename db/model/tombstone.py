@@ -0,0 +1,16 @@
+# models/tombstone.py
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String
+from ..db_setup import Base
+
+class Tombstone(Base):
+    """A deleted row, kept so the changes feeds can report the deletion."""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_resource_id", "resource", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resource = Column(String(50), nullable=False)  # table name of the deleted row
+    resource_id = Column(String(50), nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,10 +1,18 @@
 # models/transfer.py
-from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index, Boolean
 from .mixins import Timestamp
 from ..db_setup import Base
 
 class TransfersDispatcher(Timestamp, Base):
     __tablename__ = "transfers"
+    __table_args__ = (
+        # Dashboards filter on one owner column plus a DateRealized range.
+        Index("ix_transfers_company_date", "CompanyId", "DateRealized"),
+        Index("ix_transfers_dispatcher_date", "DispatcherId", "DateRealized"),
+        Index("ix_transfers_vehicle_date", "VehicleId", "DateRealized"),
+        # Date ranges with no owner filter: analytics over today, rollup refreshes.
+        Index("ix_transfers_date", "DateRealized"),
+    )
 
     id = Column(String(10), primary_key=True, index=True)
     OID = Column(Integer, nullable=True)
@@ -17,4 +25,6 @@ class TransfersDispatcher(Timestamp, Base):
     GrandTotalStart = Column(Float, nullable=True)
     BatchTotal = Column(Float, nullable=True)
     Type = Column(String(50), nullable=True)
-    BatchPrice = Column(Float, nullable=True)
\ No newline at end of file
+    BatchPrice = Column(Float, nullable=True)
+    # Set when the transfer took its vehicle over MonthLimit.
+    LimitExceeded = Column(Boolean, nullable=True)
\ No newline at end of file
@@ -0,0 +1,29 @@
+# models/transfer_rollup.py
+from sqlalchemy import Column, DateTime, Float, Integer, String
+from ..db_setup import Base
+
+class TransferDailyRollup(Base):
+    """Per-day transfer totals, rebuilt from transfers by api/crud/analytics.py."""
+    __tablename__ = "transfer_daily_rollups"
+
+    day = Column(DateTime, primary_key=True)
+    # '' stands for a transfer without that owner, since key columns cannot be NULL.
+    CompanyId = Column(String(10), primary_key=True)
+    DispatcherId = Column(String(10), primary_key=True)
+    VehicleId = Column(String(10), primary_key=True)
+    transfers = Column(Integer, nullable=False)
+    volume = Column(Float, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+class TransferRollupStaleDay(Base):
+    """A day a transfer left (deleted, or DateRealized moved), rebuilt by the next refresh."""
+    __tablename__ = "transfer_rollup_stale_days"
+
+    day = Column(DateTime, primary_key=True)
+
+class TransferRollupWatermark(Base):
+    """Single row: transfers.updated_at up to which the rollups are current."""
+    __tablename__ = "transfer_rollup_watermark"
+
+    id = Column(Integer, primary_key=True)
+    refreshed_until = Column(DateTime, nullable=False)
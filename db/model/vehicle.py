@@ -1,5 +1,5 @@
 # models/vehicle.py
-from sqlalchemy import Column, String, Float, Boolean
+from sqlalchemy import Column, String, Float, Boolean, DateTime
 from .mixins import Timestamp
 from ..db_setup import Base
 
@@ -12,6 +12,8 @@ class Vehicle(Timestamp, Base):
     CardName = Column(String(100), nullable=True)
     MonthLimit = Column(Float, nullable=True)
     MontTransfer = Column(Float, nullable=True)
+    # First day of the month MontTransfer is counting.
+    UsageMonth = Column(DateTime, nullable=True)
     Totaltransfer = Column(Float, nullable=True)
     CardTypeID = Column(String(50), nullable=True)
     RfId = Column(String(50), nullable=True)
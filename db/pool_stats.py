@@ -0,0 +1,71 @@
+# db/pool_stats.py
+import threading
+import time
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from db.query_stats import record_pool_wait
+
+
+class WaitStats:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "total_seconds": round(self.total, 6),
+                "max_seconds": round(self.max, 6),
+                "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            }
+
+
+class _TimedCheckout:
+    # Time spent in _do_get covers both waiting on a busy pool and opening a
+    # new connection, i.e. everything a request pays before it can run SQL.
+    wait_stats: WaitStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_stats.record(waited)
+            record_pool_wait(waited)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    wait_stats = WaitStats()
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    wait_stats = WaitStats()
+
+
+def pool_status(pool) -> dict:
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts overflow from -size; only connections above size matter here.
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _TimedCheckout):
+        status["wait"] = pool.wait_stats.snapshot()
+    return status
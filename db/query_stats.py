@@ -0,0 +1,61 @@
+# db/query_stats.py
+import contextvars
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from sqlalchemy import event
+
+
+@dataclass
+class RequestQueries:
+    """SQL work done on behalf of one request."""
+    path: str = ""
+    count: int = 0
+    seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request. The object itself is
+# shared, so queries run from threadpool endpoints or SQLAlchemy's greenlets
+# (which get a copy of the context) still add to the same totals.
+current: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar("request_queries", default=None)
+
+# Called with (statement, seconds) after every cursor execution.
+observers: List[Callable[[str, float], None]] = []
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+    for observer in observers:
+        observer(statement, seconds)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument(engine) -> None:
+    """Time every statement run on engine (sync, or the sync_engine of an async one)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
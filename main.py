@@ -1,21 +1,44 @@
+import asyncio
+import importlib
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from api.users.users import router as users_router
-from api.roles.roles import router as roles_router
-from api.stations.stations import router as stations_router
-from api.transfers.transfers import router as transfers_router
-from api.dispatchers.dispatchers import router as dispatchers_router
-from api.companies.companies import router as companies_router
-from api.vehicles.vehicles import router as vehicles_router
-from api.station_summaries.station_summaries import router as station_summaries_router
-from api.supply_regions.supply_regions import router as supply_regions_router
-from api.account_regions.account_regions import router as account_regions_router
-from api.notifications.notifications import router as notifications_router
-from routes.auth import router as auth_router
-from  db.model import user, profile, role, station, transfer, dispatcher, company, vehicle, station_summary, supply_region, account_region, notification
-from  db.db_setup import engine, Base
-
-app = FastAPI()
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+# Every model has to be registered on Base before relationships are mapped.
+from  db.model import user, profile, role, station, transfer, dispatcher, company, vehicle, station_summary, supply_region, account_region, notification, tombstone, transfer_rollup
+from  db.db_setup import Base, async_engine, engine
+from api.crud import analytics, events, hashing, summary_refresh, vehicle_limits
+from api.crud.jobs import run_periodically
+
+# Schema changes belong to Alembic, applied by python migrate.py on deploy
+# (render.yaml and the Dockerfile run it before server.py). DB_CREATE_ALL=true
+# creates missing tables at startup instead; it is for a single local
+# uvicorn process against a scratch database, never for multi-worker serving.
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() in ("1", "true", "yes")
+
+# (module, prefix) of every router, imported when the app is built.
+ROUTERS = [
+    ("routes.auth", "/api"),
+    ("api.users.users", "/api"),
+    ("api.roles.roles", "/api"),
+    ("api.menuItems.menuitems", "/api"),
+    ("api.stations.stations", "/api"),
+    ("api.transfers.transfers", "/api"),
+    ("api.dispatchers.dispatchers", "/api"),
+    ("api.companies.companies", "/api"),
+    ("api.vehicles.vehicles", "/api"),
+    ("api.station_summaries.station_summaries", "/api"),
+    ("api.supply_regions.supply_regions", "/api"),
+    ("api.account_regions.account_regions", "/api"),
+    ("api.notifications.notifications", "/api"),
+    ("api.system.system", "/api"),
+    ("api.events.events", "/api"),
+    ("api.analytics.analytics", "/api"),
+    ("api.metrics.metrics", ""),
+]
 
 origins = [
     "http://localhost",
@@ -23,26 +46,68 @@ origins = [
     # Add your frontend URL
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth_router, prefix="/api")
-app.include_router(users_router, prefix="/api")
-app.include_router(roles_router, prefix="/api")
-app.include_router(stations_router, prefix="/api")
-app.include_router(transfers_router, prefix="/api")
-app.include_router(dispatchers_router, prefix="/api")
-app.include_router(companies_router, prefix="/api")
-app.include_router(vehicles_router, prefix="/api")
-app.include_router(station_summaries_router, prefix="/api")
-app.include_router(supply_regions_router, prefix="/api")
-app.include_router(account_regions_router, prefix="/api")
-app.include_router(notifications_router, prefix="/api")
-
-# Create tables
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_ALL:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    refresher = asyncio.create_task(run_periodically(
+        summary_refresh.refresh_station_summaries,
+        summary_refresh.STATION_SUMMARY_REFRESH_SECONDS,
+        wake=summary_refresh.dirty,
+        debounce=summary_refresh.STATION_SUMMARY_MIN_INTERVAL_SECONDS,
+    ))
+    rollups = asyncio.create_task(run_periodically(
+        analytics.refresh_transfer_rollups,
+        analytics.TRANSFER_ROLLUP_REFRESH_SECONDS,
+    ))
+    rollover = asyncio.create_task(run_periodically(
+        vehicle_limits.rollover_vehicle_months,
+        vehicle_limits.VEHICLE_ROLLOVER_CHECK_SECONDS,
+    ))
+    listener = asyncio.create_task(events.run_listener())
+    yield
+    tasks = [refresher, rollups, rollover, listener]
+    for task in tasks:
+        task.cancel()
+    # Let each task unwind (and return its connection) before the pools close.
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # The bcrypt processes would otherwise outlive the worker.
+    hashing.shutdown_executor()
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Nothing here touches the database: engines connect
+    on first use, and tables are left to Alembic (or DB_CREATE_ALL).
+    """
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
+    )
+    app.add_middleware(CompressionMiddleware)
+    # Outermost, so latency covers compression and every other middleware.
+    app.add_middleware(MetricsMiddleware)
+
+    for module, prefix in ROUTERS:
+        app.include_router(importlib.import_module(module).router, prefix=prefix)
+    return app
+
+
+def __getattr__(name: str):
+    # "uvicorn main:app" keeps working: the app is built on first access
+    # rather than whenever main is imported.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
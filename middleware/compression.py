@@ -0,0 +1,168 @@
+# middleware/compression.py
+import os
+import zlib
+from typing import List, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+# Bodies smaller than this are sent as is; the encoding overhead is not worth it.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+# Media types worth compressing. text/event-stream is left out on purpose:
+# compressors buffer, and events must reach the client as they happen.
+COMPRESSION_TYPES = [
+    media_type.strip()
+    for media_type in os.getenv(
+        "COMPRESSION_TYPES", "application/json,application/x-ndjson,text/csv,text/plain,text/html"
+    ).split(",")
+    if media_type.strip()
+]
+
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31: zlib stream with a gzip header and trailer.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _accepted(accept_encoding: str) -> List[str]:
+    """Codings the client accepts, ignoring q=0 entries."""
+    codings = []
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            codings.append(coding.strip().lower())
+    return codings
+
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip response compression, as a pure ASGI middleware.
+
+    Whole bodies under minimum_size go out unchanged. Streaming responses
+    (NDJSON/CSV exports) are compressed chunk by chunk with a flush after each
+    one, so the client keeps receiving data while the export runs.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        media_types: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.media_types = media_types if media_types is not None else COMPRESSION_TYPES
+
+    def _encoder(self, scope):
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        accepted = _accepted(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return lambda: _Brotli(self.brotli_quality)
+        if "gzip" in accepted or "*" in accepted:
+            return lambda: _Gzip(self.gzip_level)
+        return None
+
+    def _compressible(self, headers) -> bool:
+        media_type = ""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                media_type = value.decode("latin-1").split(";")[0].strip().lower()
+        return media_type in self.media_types
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        make_encoder = self._encoder(scope)
+        if make_encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = [(name, value) for name, value in start.get("headers", [])]
+                if start["status"] in (204, 304) or not self._compressible(headers):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers.append((b"vary", b"Accept-Encoding"))
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send({**start, "headers": headers})
+                    await send(message)
+                    return
+                encoder = make_encoder()
+                headers = [(name, value) for name, value in headers if name != b"content-length"]
+                headers.append((b"content-encoding", encoder.name.encode("ascii")))
+                if not more_body:
+                    # Whole body in hand: compress it in one go and send its length.
+                    body = encoder.finish(body)
+                    headers.append((b"content-length", str(len(body)).encode("ascii")))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers})
+
+            chunk = encoder.compress(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
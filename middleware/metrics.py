@@ -0,0 +1,200 @@
+# middleware/metrics.py
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+from db import query_stats
+from db.query_stats import RequestQueries
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with the request path that ran them.
+METRICS_SLOW_QUERY_SECONDS = float(os.getenv("METRICS_SLOW_QUERY_SECONDS", "0.5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, +Inf last), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = self._header()
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "Time from request start to the last body byte.", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.", ("method",))
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements run per request; high counts on list routes point at N+1 loading.",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+REQUEST_QUERY_TIME = Histogram("http_request_db_seconds", "Time spent in SQL per request.", ("method", "route"), LATENCY_BUCKETS)
+REQUEST_POOL_WAIT = Histogram(
+    "http_request_db_pool_wait_seconds", "Time per request spent waiting for a pooled connection.",
+    ("method", "route"), QUERY_BUCKETS,
+)
+QUERY_TIME = Histogram("db_query_duration_seconds", "Duration of single SQL statements.", ("operation",), QUERY_BUCKETS)
+SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than METRICS_SLOW_QUERY_SECONDS.", ("operation",))
+
+METRICS = [REQUESTS, LATENCY, IN_FLIGHT, REQUEST_QUERIES, REQUEST_QUERY_TIME, REQUEST_POOL_WAIT, QUERY_TIME, SLOW_QUERIES]
+
+_OPERATION = re.compile(r"^\s*(?:/\*.*?\*/\s*)?(\w+)", re.S)
+
+
+def _observe_query(statement: str, seconds: float) -> None:
+    match = _OPERATION.match(statement)
+    operation = match.group(1).upper() if match else "OTHER"
+    QUERY_TIME.observe(seconds, operation)
+    if seconds >= METRICS_SLOW_QUERY_SECONDS:
+        SLOW_QUERIES.inc(operation)
+        stats = query_stats.current.get()
+        logger.warning(
+            "Slow query (%.3fs) on %s: %s", seconds, stats.path if stats else "-", " ".join(statement.split())[:500]
+        )
+
+
+query_stats.observers.append(_observe_query)
+
+
+def render(extra: Iterable[str] = ()) -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Per-route request metrics, as a pure ASGI middleware.
+
+    Requests are labelled with the route template FastAPI matched
+    (/api/stations/{id}, not /api/stations/S1), so label cardinality stays
+    bounded by the number of routes. Paths that match no route share the
+    "unmatched" label. SQL statements are attributed to the request through
+    db.query_stats.current.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        stats = RequestQueries(path=scope["path"])
+        token = query_stats.current.set(stats)
+        IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec(method)
+            query_stats.current.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            REQUESTS.inc(method, template, str(status))
+            LATENCY.observe(elapsed, method, template)
+            REQUEST_QUERIES.observe(stats.count, method, template)
+            REQUEST_QUERY_TIME.observe(stats.seconds, method, template)
+            REQUEST_POOL_WAIT.observe(stats.pool_wait_seconds, method, template)
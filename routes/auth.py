@@ -2,20 +2,26 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-from jose import jwt
+from jose import jwt, JWTError
+from collections import OrderedDict
 import bcrypt
-from sqlalchemy.orm import Session
+import hashlib
+import os
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
-from ..db.db_setup import get_db
-from  ..api.crud import get_user_by_email, hash_password
-from ..db.model.user import User as UserModel
+from db.db_setup import get_async_db
+from api.crud.async_crud import user_repo
+from api.crud.hashing import verify_password_async, HashingBusyError
+from db.model.user import User as UserModel
 
 router = APIRouter()
 
 SECRET_KEY = "secret_key"  # Use environment variable in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 1
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 
@@ -44,22 +50,79 @@ def create_token(user: UserModel) -> str:
     } # type: ignore
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
+class TokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by the SHA-256 of the token.
+
+    An entry is served until the token's own exp, so a cached token expires
+    exactly when jwt.decode would start rejecting it. Only touched from the
+    event loop (verify_token is async), so no locking is needed.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        payload = self._entries.get(key)
+        if payload is None or payload["exp"] <= time.time():
+            if payload is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        if self.maxsize <= 0 or not isinstance(payload.get("exp"), (int, float)):
+            return
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        self._entries[key] = dict(payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
-def verify_token(token: str = Depends(oauth2_scheme)) -> dict: # type: ignore
+async def verify_token(token: str = Depends(oauth2_scheme)) -> dict: # type: ignore
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.InvalidTokenError:
+    except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    token_cache.put(token, payload)
+    return payload
 
 @router.post("/login", response_model=dict, tags=["auth"])
-def login(data: LoginData, db: Session = Depends(get_db)):# type: ignore
-    user = get_user_by_email(db, data.email)# type: ignore
-    if not user or not verify_password(data.password, user.password):# type: ignore
+async def login(data: LoginData, db: AsyncSession = Depends(get_async_db)):# type: ignore
+    user = await user_repo.get_by_email(db, data.email)# type: ignore
+    try:
+        valid = bool(user) and await verify_password_async(data.password, user.password)# type: ignore
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail="Login is busy, try again", headers={"Retry-After": "1"})
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     token = create_token(user)
@@ -1,8 +1,54 @@
 # scripts/seed_db.py
-import psycopg2
-from psycopg2.extras import Json
+"""
+Bulk loader for JSON / CSV dumps into PostgreSQL.
+
+    python seed_db.py                                  # the sample json_data below
+    python seed_db.py dump.json                        # {"users": [...], "TransfersDispatcher": [...], ...}
+    python seed_db.py transfers.csv dispatchers.ndjson # one section per file, named after the file
+    python seed_db.py dump/ --batch 100000             # every .json/.ndjson/.jsonl/.csv in a directory
+
+Sections are the keys of json_data below, or plain table names. Records are
+read as a stream (CSV, NDJSON, or JSON through ijson when it is installed),
+written with COPY FROM STDIN into a temporary staging table per batch, then
+moved into the real table with INSERT ... SELECT ... ON CONFLICT DO NOTHING,
+so reloading a dump is idempotent and records clashing with existing ones
+(same key, same user email) are skipped, as before. Plain-text passwords are bcrypt-hashed in
+a process pool. Secondary indexes of a table that starts empty (or of every
+table, with --rebuild-indexes) are dropped during the load and rebuilt at
+the end; primary keys and unique indexes stay, ON CONFLICT needs them.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import bcrypt
-from datetime import datetime
+import psycopg2
+from sqlalchemy import JSON, Boolean, DateTime, Enum, Float, Integer
+from api.crud.vehicle_limits import VEHICLE_LIMIT_MODE, month_start
+from db.db_setup import DATABASE_URL
+from db.model.account_region import AccountRegion
+from db.model.company import Company
+from db.model.dispatcher import Dispatcher
+from db.model.menuitem import MenuItem
+from db.model.notification import Notification
+from db.model.role import RoleList
+from db.model.station import StationItem
+from db.model.station_summary import StationSummary
+from db.model.supply_region import SupplyRegion
+from db.model.transfer import TransfersDispatcher
+from db.model.user import User
+from db.model.vehicle import Vehicle
+
+try:
+    import ijson
+except ImportError:  # optional; without it a .json dump is read into memory whole
+    ijson = None
 
 # Your JSON data (abridged for brevity)
 json_data = {
@@ -28,275 +74,423 @@ json_data = {
     # ... other sections ...
 }
 
+# Dump section -> model, in load order.
+SECTIONS = [
+    ("users", User),
+    ("rolelist", RoleList),
+    ("menuitems", MenuItem),
+    ("stationsItems", StationItem),
+    ("Company", Company),
+    ("SupplyRegion", SupplyRegion),
+    ("AccountRegion", AccountRegion),
+    ("dispatchers", Dispatcher),
+    ("vehicles", Vehicle),
+    ("TransfersDispatcher", TransfersDispatcher),
+    ("StationSummary", StationSummary),
+    ("notifications", Notification),
+]
+MODELS = {**{model.__tablename__: model for _, model in SECTIONS}, **dict(SECTIONS)}
+
+# Values for columns a record leaves out, over the model defaults.
+OVERRIDES = {"users": {"is_active": True}}
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Memory for rebuilding indexes; more means fewer sort passes.
+SEED_MAINTENANCE_WORK_MEM = os.getenv("SEED_MAINTENANCE_WORK_MEM", "1GB")
+
+NULL = "\\N"
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS)).decode('utf-8')
+
 
 def get_db_connection():
-    return psycopg2.connect(
-        host="POSTGRES_db",
-        port="5432",
-        dbname="postgres",
-        user="postgres",
-        password="1453"
-    )
+    # libpq takes the same postgresql:// URL as the application.
+    return psycopg2.connect(DATABASE_URL)
 
-def seed_database():
-    conn = get_db_connection()
-    cur = conn.cursor()
 
-    # Seed users
-    for user in json_data["users"]:
-        hashed_password = hash_password(user["password"]) if not user["password"].startswith('$2b$') else user["password"]
-        cur.execute(
-            """
-            INSERT INTO users (id, email, password, role, roleID, displayName, photoURL, pmpRestriction, settings, shortcuts, is_active)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                user["id"],
-                user["email"],
-                hashed_password,
-                user["role"],
-                user["roleID"],
-                user["displayName"],
-                user["photoURL"],
-                Json(user["pmpRestriction"]),
-                Json(user["settings"]),
-                Json(user["shortcuts"]),
-                True
+# ---------------------------------------------------------------- reading
+
+def _sections_from_json(file) -> Iterator[Tuple[str, dict]]:
+    """Records of a {"section": [records...], ...} document, in one streaming pass."""
+    from ijson.common import ObjectBuilder
+
+    section, builder = None, None
+    for prefix, event, value in ijson.parse(file):
+        if prefix == "" and event == "map_key":
+            section = value
+        elif builder is not None:
+            builder.event(event, value)
+            if prefix == f"{section}.item" and event == "end_map":
+                yield section, builder.value
+                builder = None
+        elif prefix == f"{section}.item" and event == "start_map":
+            builder = ObjectBuilder()
+            builder.event(event, value)
+
+
+def _records_from_json(path: str, stem: str) -> Iterator[Tuple[str, dict]]:
+    if ijson is not None:
+        with open(path, "rb") as file:
+            first = file.read(64).lstrip()[:1]
+            file.seek(0)
+            if first == b"[":
+                yield from ((stem, record) for record in ijson.items(file, "item"))
+            else:
+                yield from _sections_from_json(file)
+        return
+    with open(path, encoding="utf-8") as file:
+        document = json.load(file)
+    if isinstance(document, list):
+        yield from ((stem, record) for record in document)
+    else:
+        yield from ((section, record) for section, records in document.items() for record in records)
+
+
+def _records_from_ndjson(path: str, stem: str) -> Iterator[Tuple[str, dict]]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield stem, json.loads(line)
+
+
+def _records_from_csv(path: str, stem: str) -> Iterator[Tuple[str, dict]]:
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            # CSV has no NULL; an empty cell is one.
+            yield stem, {name: (value if value != "" else None) for name, value in row.items()}
+
+
+READERS = {
+    ".json": _records_from_json,
+    ".ndjson": _records_from_ndjson,
+    ".jsonl": _records_from_ndjson,
+    ".csv": _records_from_csv,
+}
+
+
+def read_sources(paths: List[str]) -> Iterator[Tuple[str, dict]]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if os.path.splitext(name)[1].lower() in READERS
             )
+        else:
+            files.append(path)
+    for path in files:
+        stem, extension = os.path.splitext(os.path.basename(path))
+        reader = READERS.get(extension.lower())
+        if reader is None:
+            raise SystemExit(f"Unsupported dump format: {path}")
+        yield from reader(path, stem)
+
+
+# ---------------------------------------------------------------- converting
+
+def _datetime(value) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        # Columns are timestamp without time zone, stored as UTC.
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _json(value) -> str:
+    if isinstance(value, str):
+        return value  # already JSON text, e.g. from a CSV cell
+    # ijson yields Decimal for JSON numbers.
+    return json.dumps(value, default=float, ensure_ascii=False)
+
+
+def _boolean(value) -> str:
+    if isinstance(value, str):
+        value = value.strip().lower() in ("1", "t", "true", "yes", "y")
+    return "t" if value else "f"
+
+
+def _enum(value) -> str:
+    return value.name if hasattr(value, "name") else str(value)
+
+
+def _converter(column) -> Callable:
+    if isinstance(column.type, JSON):
+        return _json
+    if isinstance(column.type, DateTime):
+        return _datetime
+    if isinstance(column.type, Boolean):
+        return _boolean
+    if isinstance(column.type, Enum):
+        return _enum
+    if isinstance(column.type, Float):
+        return lambda value: repr(float(value))
+    if isinstance(column.type, Integer):
+        return lambda value: str(int(value))
+    return str
+
+
+class TableLoader:
+    """Moves batches of one section's records into its table, through the seed_stage temp table."""
+
+    def __init__(self, model, hash_pool: Optional[ProcessPoolExecutor]):
+        self.table = model.__tablename__
+        self.columns = list(model.__table__.columns)
+        self.converters = [_converter(column) for column in self.columns]
+        self.defaults = self._defaults()
+        self.hash_pool = hash_pool
+        self.column_list = ", ".join(f'"{column.name}"' for column in self.columns)
+        self.loaded = 0
+        self.inserted = 0
+
+    def create_stage(self, cur) -> None:
+        cur.execute("DROP TABLE IF EXISTS seed_stage")
+        cur.execute(f'CREATE TEMP TABLE seed_stage AS SELECT {self.column_list} FROM "{self.table}" WITH NO DATA')
+
+    def _defaults(self) -> Dict[str, Callable]:
+        defaults = {}
+        overrides = OVERRIDES.get(self.table, {})
+        for column in self.columns:
+            if column.name in overrides:
+                value = overrides[column.name]
+                defaults[column.name] = lambda value=value: value
+            elif column.default is not None and column.default.is_callable:
+                defaults[column.name] = lambda default=column.default: default.arg(None)
+            elif column.default is not None and column.default.is_scalar:
+                defaults[column.name] = lambda value=column.default.arg: value
+        return defaults
+
+    def _hash_passwords(self, records: List[dict]) -> None:
+        plain = [record for record in records if record.get("password") and not str(record["password"]).startswith("$2")]
+        if not plain:
+            return
+        passwords = [str(record["password"]) for record in plain]
+        if self.hash_pool is None:
+            hashed = map(hash_password, passwords)
+        else:
+            hashed = self.hash_pool.map(hash_password, passwords, chunksize=max(len(passwords) // 64, 1))
+        for record, value in zip(plain, hashed):
+            record["password"] = value
+
+    def _csv(self, records: List[dict]) -> io.StringIO:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            row = []
+            for column, convert in zip(self.columns, self.converters):
+                value = record.get(column.name)
+                if value is None and column.name in self.defaults:
+                    value = self.defaults[column.name]()
+                row.append(NULL if value is None else convert(value))
+            writer.writerow(row)
+        buffer.seek(0)
+        return buffer
+
+    def load(self, cur, records: List[dict]) -> None:
+        if self.table == "users":
+            self._hash_passwords(records)
+        cur.copy_expert(
+            f"COPY seed_stage ({self.column_list}) FROM STDIN WITH (FORMAT csv, NULL '{NULL}')",
+            self._csv(records),
         )
-        # Seed profiles
-        first_name, last_name = user["displayName"].split(" ", 1) if " " in user["displayName"] else (user["displayName"], "")
         cur.execute(
-            """
-            INSERT INTO profiles (first_name, last_name, user_id)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (user_id) DO NOTHING
-            """,
-            (first_name, last_name, user["id"])
+            f'INSERT INTO "{self.table}" ({self.column_list}) SELECT {self.column_list} FROM seed_stage '
+            # Any unique violation (id, users.email) skips the record.
+            "ON CONFLICT DO NOTHING"
         )
+        self.inserted += cur.rowcount
+        if self.table == "users":
+            # Every new user gets a profile, named after displayName. The join
+            # leaves out records ON CONFLICT skipped (e.g. an email already
+            # taken by another id), which have no users row to point at.
+            cur.execute(
+                """
+                INSERT INTO profiles (first_name, last_name, user_id, created_at, updated_at)
+                SELECT split_part(s."displayName", ' ', 1),
+                       CASE WHEN position(' ' in s."displayName") > 0
+                            THEN substring(s."displayName" from position(' ' in s."displayName") + 1) ELSE '' END,
+                       s.id, s.created_at, s.updated_at
+                FROM seed_stage s
+                JOIN users u ON u.id = s.id
+                WHERE NOT EXISTS (SELECT 1 FROM profiles p WHERE p.user_id = s.id)
+                """
+            )
+        cur.execute("TRUNCATE seed_stage")
+        self.loaded += len(records)
 
-    # Seed rolelist
-    for role in json_data["rolelist"]:
-        cur.execute(
-            """
-            INSERT INTO rolelist (id, RoleName, menuitems)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (role["id"], role["RoleName"], Json(role["menuitems"]))
-        )
 
-    # Seed menuitems
-    for item in json_data["menuitems"]:
-        cur.execute(
-            """
-            INSERT INTO menuitems (menuID, menuDisplayname, menuurl, title, subtitle, type, icon, translate, translateKey, children)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (menuID) DO NOTHING
-            """,
-            (
-                item["menuID"],
-                item["menuDisplayname"],
-                item["menuurl"],
-                item.get("title"),
-                item.get("subtitle"),
-                item.get("type"),
-                item.get("icon"),
-                item.get("translate"),
-                item.get("translateKey"),
-                Json(item["children"])
-            )
-        )
+# ---------------------------------------------------------------- indexes
 
-    # Seed stations
-    for station in json_data["stationsItems"]:
-        cur.execute(
-            """
-            INSERT INTO stations (id, name, address, taxOffice, taxNumber, lat, lng, phone, "order", status, PumperId, city, CompanyId)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                station["id"],
-                station["name"],
-                station["address"],
-                station["taxOffice"],
-                station["taxNumber"],
-                station["lat"],
-                station["lng"],
-                station["phone"],
-                station["order"],
-                station["status"],
-                station["PumperId"],
-                station["city"],
-                station["CompanyId"]
-            )
-        )
+def secondary_indexes(cur, table: str) -> List[Tuple[str, str]]:
+    """(name, CREATE INDEX statement) of the indexes a bulk load can do without."""
+    cur.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = %s::regclass
+          AND NOT x.indisunique AND NOT x.indisprimary
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.oid)
+        """,
+        (f'"{table}"',),
+    )
+    return cur.fetchall()
 
-    # Seed transfers
-    for transfer in json_data["TransfersDispatcher"]:
-        cur.execute(
-            """
-            INSERT INTO transfers (id, OID, CompanyId, DispatcherId, VehicleId, Status, DateRealized, CreateDate, GrandTotalStart, BatchTotal, Type, BatchPrice)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                transfer["id"],
-                transfer["OID"],
-                transfer["CompanyId"],
-                transfer["DispatcherId"],
-                transfer["VehicleId"],
-                transfer["Status"],
-                datetime.fromisoformat(transfer["DateRealized"].replace("Z", "+00:00")),
-                transfer["CreateDate"],
-                float(transfer["GrandTotalStart"]),
-                float(transfer["BatchTotal"]),
-                transfer["Type"],
-                float(transfer["BatchPrice"])
-            )
-        )
 
-    # Seed dispatchers
-    for dispatcher in json_data["dispatchers"]:
-        cur.execute(
-            """
-            INSERT INTO dispatchers (id, IMEI, StationId, DispatcherName, LastUpdateDate, GrandTotal, K, isActive, DaviceId, Version, Tell, City, PName, District, PumpModel, isNotificationMailActive, CompanyId)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                dispatcher["id"],
-                dispatcher["IMEI"],
-                dispatcher["StationId"],
-                dispatcher["DispatcherName"],
-                datetime.fromisoformat(dispatcher["LastUpdateDate"].replace("Z", "+00:00")),
-                float(dispatcher["GrandTotal"]),
-                dispatcher["K"],
-                dispatcher["isActive"],
-                dispatcher["DaviceId"],
-                datetime.fromisoformat(dispatcher["Version"].replace("Z", "+00:00")),
-                dispatcher["Tell"],
-                dispatcher["City"],
-                dispatcher["PName"],
-                dispatcher["District"],
-                dispatcher["PumpModel"],
-                dispatcher["isNotificationMailActive"],
-                dispatcher["CompanyId"]
-            )
-        )
+def rebuild_indexes(conn, table: str, indexes: List[Tuple[str, str]]) -> None:
+    if not indexes:
+        return
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute("SET maintenance_work_mem = %s", (SEED_MAINTENANCE_WORK_MEM,))
+        for _, definition in indexes:
+            cur.execute(definition)
+        cur.execute(f'ANALYZE "{table}"')
+    conn.commit()
+    print(f"  {table}: rebuilt {len(indexes)} indexes in {time.perf_counter() - started:.1f}s")
 
-    # Seed companies
-    for company in json_data["Company"]:
-        cur.execute(
-            """
-            INSERT INTO companies (CompanyId, CompanyName, OwnerId)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (CompanyId) DO NOTHING
-            """,
-            (company["CompanyId"], company["CompanyName"], company["OwnerId"])
-        )
 
-    # Seed vehicles
-    for vehicle in json_data["vehicles"]:
-        cur.execute(
-            """
-            INSERT INTO vehicles (VehicleId, OID, Company, CardName, MonthLimit, MontTransfer, Totaltransfer, CardTypeID, RfId, IsActive)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (VehicleId) DO NOTHING
-            """,
-            (
-                vehicle["VehicleId"],
-                vehicle["OID"],
-                vehicle["Company"],
-                vehicle["CardName"],
-                float(vehicle["MonthLimit"]),
-                float(vehicle["MontTransfer"]),
-                float(vehicle["Totaltransfer"]),
-                vehicle["CardTypeID"],
-                vehicle["RfId"],
-                vehicle["IsActive"]
-            )
-        )
+# ---------------------------------------------------------------- vehicle usage
 
-    # Seed station summaries
-    for summary in json_data["StationSummary"]:
-        cur.execute(
-            """
-            INSERT INTO station_summaries (id, supplyId, accountId, name, address, taxOffice, taxNumber, lat, lng, phone, "order", city, PumperId, CompanyId, status, Dispatchers)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                summary["id"],
-                summary["supplyId"],
-                summary["accountId"],
-                summary["name"],
-                summary["address"],
-                summary["taxOffice"],
-                summary["taxNumber"],
-                summary["lat"],
-                summary["lng"],
-                summary["phone"],
-                summary["order"],
-                summary["city"],
-                summary["PumperId"],
-                summary["CompanyId"],
-                summary["status"],
-                Json(summary["Dispatchers"])
+def refresh_vehicle_usage() -> None:
+    """
+    Loaded transfers bypass api/crud/vehicle_limits.py, so bring every
+    vehicle's usage of the current month, and the LimitExceeded flags of that
+    month's transfers, in line with the transfers table: one set-based UPDATE
+    each. Older months only count towards Totaltransfer, which is left as the
+    dump has it.
+    """
+    month = month_start()
+    params = {"month": month, "next": month_start(month + timedelta(days=32)), "now": datetime.utcnow()}
+    started = time.perf_counter()
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE vehicles v
+                SET "MontTransfer" = u.total, "UsageMonth" = %(month)s, updated_at = %(now)s
+                FROM (
+                    SELECT x."VehicleId", COALESCE(sum(t."BatchTotal"), 0) AS total
+                    FROM vehicles x
+                    LEFT JOIN transfers t ON t."VehicleId" = x."VehicleId"
+                        AND t."DateRealized" >= %(month)s AND t."DateRealized" < %(next)s
+                    GROUP BY x."VehicleId"
+                ) u
+                WHERE u."VehicleId" = v."VehicleId"
+                  AND (v."MontTransfer" IS DISTINCT FROM u.total OR v."UsageMonth" IS DISTINCT FROM %(month)s)
+                """,
+                params,
             )
-        )
+            recharged = cur.rowcount
+            # Like charge_transfers: every transfer from the one that crossed MonthLimit on is flagged.
+            cur.execute(
+                """
+                UPDATE transfers t
+                SET "LimitExceeded" = r.running > r."MonthLimit", updated_at = %(now)s
+                FROM (
+                    SELECT x.id, v."MonthLimit",
+                           sum(COALESCE(x."BatchTotal", 0)) OVER (PARTITION BY x."VehicleId" ORDER BY x."DateRealized", x.id) AS running
+                    FROM transfers x
+                    JOIN vehicles v ON v."VehicleId" = x."VehicleId"
+                    WHERE x."DateRealized" >= %(month)s AND x."DateRealized" < %(next)s
+                      AND v."MonthLimit" IS NOT NULL
+                ) r
+                WHERE t.id = r.id AND t."LimitExceeded" IS DISTINCT FROM (r.running > r."MonthLimit")
+                """,
+                params,
+            )
+            flagged = cur.rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"vehicle usage of {month:%Y-%m}: {recharged:,} vehicles and {flagged:,} LimitExceeded flags corrected in {time.perf_counter() - started:.1f}s")
 
-    # Seed supply regions
-    for region in json_data["SupplyRegion"]:
-        cur.execute(
-            """
-            INSERT INTO supply_regions (Id, name)
-            VALUES (%s, %s)
-            ON CONFLICT (Id) DO NOTHING
-            """,
-            (region["Id"], region["name"])
-        )
 
-    # Seed account regions
-    for region in json_data["AccountRegion"]:
-        cur.execute(
-            """
-            INSERT INTO account_regions (Id, name)
-            VALUES (%s, %s)
-            ON CONFLICT (Id) DO NOTHING
-            """,
-            (region["Id"], region["name"])
-        )
+# ---------------------------------------------------------------- loading
 
-    # Seed notifications
-    for notification in json_data["notifications"]:
-        cur.execute(
-            """
-            INSERT INTO notifications (id, company_id, station_id, dispatcher_id, transfer_batch_total, transfer_grand_total_start, transfer_create_date, company_name, station_name, dispatcher_name)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                notification["id"],
-                notification["company_id"],
-                notification["station_id"],
-                notification["dispatcher_id"],
-                notification["transfer_batch_total"],
-                notification["transfer_grand_total_start"],
-                datetime.fromisoformat(notification["transfer_create_date"].replace("Z", "+00:00")),
-                notification["company_name"],
-                notification["station_name"],
-                notification["dispatcher_name"]
-            )
-        )
+def _batches(records: Iterable[Tuple[str, dict]], size: int) -> Iterator[Tuple[str, List[dict]]]:
+    """Consecutive records of one section, at most size at a time."""
+    section, batch = None, []
+    for record_section, record in records:
+        if record_section != section or len(batch) >= size:
+            if batch:
+                yield section, batch
+            section, batch = record_section, []
+        batch.append(record)
+    if batch:
+        yield section, batch
+
+
+def seed_database(records: Iterable[Tuple[str, dict]], batch_size: int = 50_000, hash_workers: Optional[int] = None, rebuild_all: bool = False):
+    conn = get_db_connection()
+    loaders: Dict[str, TableLoader] = {}
+    dropped: Dict[str, List[Tuple[str, str]]] = {}
+    hash_pool = ProcessPoolExecutor(max_workers=hash_workers) if hash_workers != 0 else None
+    started = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            # Losing the last commits to a crash is fine: reloading is idempotent.
+            cur.execute("SET synchronous_commit = off")
+            staged = None
+            for section, batch in _batches(records, batch_size):
+                model = MODELS.get(section)
+                if model is None:
+                    print(f"  skipping unknown section {section!r} ({len(batch)} records)", file=sys.stderr)
+                    continue
+                loader = loaders.get(model.__tablename__)
+                if loader is None:
+                    loader = loaders[model.__tablename__] = TableLoader(model, hash_pool)
+                    cur.execute(f'SELECT NOT EXISTS (SELECT 1 FROM "{loader.table}")')
+                    if cur.fetchone()[0] or rebuild_all:
+                        # Nothing reads a table that was empty; rebuilding its
+                        # indexes once beats updating them row by row.
+                        dropped[loader.table] = secondary_indexes(cur, loader.table)
+                        for name, _ in dropped[loader.table]:
+                            cur.execute(f'DROP INDEX "{name}"')
+                if staged is not loader:
+                    loader.create_stage(cur)
+                    staged = loader
+                loader.load(cur, batch)
+                conn.commit()
+                rate = sum(item.loaded for item in loaders.values()) / (time.perf_counter() - started)
+                print(f"\r  {loader.table}: {loader.loaded:,} read, {loader.inserted:,} new ({rate:,.0f} rows/s)", end="", file=sys.stderr)
+            print(file=sys.stderr)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        # Indexes come back even when the load fails half-way.
+        for table, indexes in dropped.items():
+            rebuild_indexes(conn, table, indexes)
+        if hash_pool is not None:
+            hash_pool.shutdown()
+        conn.close()
+    for loader in loaders.values():
+        print(f"{loader.table}: {loader.loaded:,} records, {loader.inserted:,} inserted")
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    if VEHICLE_LIMIT_MODE != "off" and ("transfers" in loaders or "vehicles" in loaders):
+        refresh_vehicle_usage()
+    if "transfers" in loaders:
+        print("transfers changed: rebuild the daily rollups with POST /api/analytics/rollups/refresh?full=true")
+
+
+def _sample_records() -> Iterator[Tuple[str, dict]]:
+    for section, _ in SECTIONS:
+        for record in json_data.get(section, []):
+            yield section, dict(record)
 
-    conn.commit()
-    cur.close()
-    conn.close()
 
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help="dump files or directories (default: the built-in sample)")
+    parser.add_argument("--batch", type=int, default=50_000, help="records per COPY")
+    parser.add_argument("--hash-workers", type=int, default=None, help="password hashing processes (default: CPU count; 0 hashes inline)")
+    parser.add_argument("--rebuild-indexes", action="store_true", help="drop and rebuild secondary indexes even on tables that already have rows")
+    args = parser.parse_args()
+    if not DATABASE_URL.startswith("postgresql"):
+        raise SystemExit("seed_db.py loads with COPY and needs a PostgreSQL DATABASE_URL")
+    source = read_sources(args.sources) if args.sources else _sample_records()
+    seed_database(source, args.batch, args.hash_workers, args.rebuild_indexes)
@@ -0,0 +1,69 @@
+"""
+Production entry point: python server.py
+
+Runs main:create_app under uvicorn with one worker process per available CPU,
+uvloop and httptools when they are installed, and DB pools sized per worker
+(see DB_MAX_CONNECTIONS in db/db_setup.py).
+
+Signals, handled by uvicorn's process manager:
+    SIGTERM / SIGINT   stop accepting, finish in-flight requests (up to SERVER_GRACEFUL_TIMEOUT), exit
+    SIGHUP             restart the workers one at a time, e.g. after a deploy
+    SIGTTIN / SIGTTOU  add / remove a worker
+"""
+import importlib.util
+import os
+import uvicorn
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Keep idle connections open longer than the load balancer does, so it never
+# reuses a connection the server has just closed.
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+# Recycle a worker after this many requests (0: never), bounding slow leaks.
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+# Request logging is covered by /metrics; per-request access log lines cost throughput.
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "false").lower() in ("1", "true", "yes")
+
+
+def worker_count() -> int:
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(int(os.environ["WEB_CONCURRENCY"]), 1)
+    # CPUs this process may run on, which respects container CPU sets.
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    workers = worker_count()
+    # Workers inherit the environment; db_setup divides DB_MAX_CONNECTIONS by this.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    print(f"Starting {workers} worker(s) on {HOST}:{PORT} (loop={loop}, http={http})", flush=True)
+    uvicorn.run(
+        "main:create_app",
+        factory=True,
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=SERVER_MAX_REQUESTS or None,
+        access_log=SERVER_ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+The app as main.create_app() builds it, on a SQLite file in a temporary
+directory, driven through httpx's in-process ASGI transport. The lifespan
+does not run, so no background job races the tests; each test starts from
+empty tables.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="fastapid-tests-"), "test.db")
+# Changes are served as soon as they are written, not after the safety lag.
+os.environ["CHANGES_SAFETY_LAG_SECONDS"] = "0"
+os.environ["VEHICLE_LIMIT_MODE"] = "flag"
+
+import httpx
+import pytest
+from api.crud import menu_cache
+from db.db_setup import Base, async_engine, engine
+from db.model.user import Role
+from main import create_app
+from routes.auth import create_token
+
+
+class _Admin:
+    id = "1"
+    email = "admin@example.com"
+    role = Role.admin
+    roleID = "1"
+    displayName = "Admin"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    menu_cache.invalidate()
+    yield
+
+
+@pytest.fixture
+async def client(app):
+    headers = {"Authorization": f"Bearer {create_token(_Admin)}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", headers=headers) as client:
+        yield client
+    # Pooled aiosqlite connections belong to this test's event loop.
+    await async_engine.dispose()
@@ -0,0 +1,20 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_upsert_reports_created_and_updated(client):
+    await client.post("/api/dispatchers/bulk", json=[{"id": 1, "DispatcherName": "a", "IMEI": "111"}])
+    response = await client.post("/api/dispatchers/bulk", json=[
+        {"id": 1, "DispatcherName": "b"},
+        {"id": 2, "DispatcherName": "c"},
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["updated"]) == (1, 1)
+    assert {str(item["id"]): item["status"] for item in body["results"]} == {"1": "updated", "2": "created"}
+
+    dispatcher = (await client.get("/api/dispatchers/1")).json()
+    # Columns a record leaves out are not overwritten.
+    assert dispatcher["DispatcherName"] == "b"
+    assert dispatcher["IMEI"] == "111"
@@ -0,0 +1,39 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_changes_feed_reports_writes_and_deletions_after_the_watermark(client):
+    await client.post("/api/companies/", json={"CompanyId": "C1", "CompanyName": "One"})
+    await client.post("/api/companies/", json={"CompanyId": "C2", "CompanyName": "Two"})
+    full = (await client.get("/api/companies/changes")).json()
+    assert [row["CompanyId"] for row in full["changes"]] == ["C1", "C2"]
+    assert full["deleted"] == []
+    assert not full["has_more"]
+
+    await client.put("/api/companies/C2", json={"CompanyName": "Deux"})
+    assert (await client.delete("/api/companies/C1")).status_code == 200
+    delta = (await client.get("/api/companies/changes", params={"since": full["watermark"]})).json()
+    assert [row["CompanyName"] for row in delta["changes"]] == ["Deux"]
+    assert [item["id"] for item in delta["deleted"]] == ["C1"]
+
+    # Nothing new after the latest watermark.
+    empty = (await client.get("/api/companies/changes", params={"since": delta["watermark"]})).json()
+    assert empty["changes"] == [] and empty["deleted"] == []
+
+
+async def test_changes_feed_pages_with_has_more(client):
+    for i in range(5):
+        await client.post("/api/companies/", json={"CompanyId": f"C{i}", "CompanyName": f"Company {i}"})
+    seen, since = [], None
+    while True:
+        page = (await client.get("/api/companies/changes", params={"limit": 2, **({"since": since} if since else {})})).json()
+        seen += [row["CompanyId"] for row in page["changes"]]
+        since = page["watermark"]
+        if not page["has_more"]:
+            break
+    assert seen == [f"C{i}" for i in range(5)]
+
+
+async def test_invalid_watermark_is_rejected(client):
+    assert (await client.get("/api/companies/changes", params={"since": "bogus"})).status_code == 400
@@ -0,0 +1,33 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_get_answers_304_until_the_row_changes(client):
+    await client.post("/api/stations/", json={"id": "S1", "name": "North"})
+    first = await client.get("/api/stations/S1")
+    etag = first.headers["ETag"]
+
+    cached = await client.get("/api/stations/S1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    await client.put("/api/stations/S1", json={"name": "South"})
+    changed = await client.get("/api/stations/S1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["name"] == "South"
+
+
+async def test_list_answers_304_and_keeps_the_cursor(client):
+    for i in range(3):
+        await client.post("/api/stations/", json={"id": f"S{i}", "name": f"Station {i}"})
+    first = await client.get("/api/stations/?limit=2")
+
+    cached = await client.get("/api/stations/?limit=2", headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+    assert cached.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    # A projection renders the same rows differently.
+    projected = await client.get("/api/stations/?limit=2&fields=name", headers={"If-None-Match": first.headers["ETag"]})
+    assert projected.status_code == 200
@@ -0,0 +1,16 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_role_menu_follows_menu_item_and_role_writes(client):
+    await client.post("/api/menuitems/", json={"menuID": "M1", "menuDisplayname": "Home"})
+    await client.post("/api/menuitems/", json={"menuID": "M2", "menuDisplayname": "Reports"})
+    await client.post("/api/roles/", json={"id": "R1", "RoleName": "viewer", "menuitems": ["M1"]})
+    assert [item["menuDisplayname"] for item in (await client.get("/api/roles/R1/menu")).json()] == ["Home"]
+
+    await client.put("/api/menuitems/M1", json={"menuDisplayname": "Start"})
+    assert [item["menuDisplayname"] for item in (await client.get("/api/roles/R1/menu")).json()] == ["Start"]
+
+    await client.put("/api/roles/R1", json={"RoleName": "viewer", "menuitems": ["M2", "M1"]})
+    assert [item["menuID"] for item in (await client.get("/api/roles/R1/menu")).json()] == ["M2", "M1"]
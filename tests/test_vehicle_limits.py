@@ -0,0 +1,77 @@
+from datetime import datetime
+import pytest
+from api.crud import vehicle_limits
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def now():
+    return datetime.utcnow().isoformat()
+
+
+async def _usage(client, vehicle_id: str) -> float:
+    return (await client.get(f"/api/vehicles/{vehicle_id}/usage")).json()["usage"]
+
+
+async def _flag(client, transfer_id: str):
+    return (await client.get(f"/api/transfers/{transfer_id}")).json()["LimitExceeded"]
+
+
+async def test_create_update_and_delete_move_vehicle_usage(client, now):
+    await client.post("/api/vehicles/", json={"VehicleId": "V1", "MonthLimit": 1000})
+    await client.post("/api/vehicles/", json={"VehicleId": "V2", "MonthLimit": 1000})
+    await client.post("/api/transfers/", json={"id": "T1", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 60})
+    await client.post("/api/transfers/", json={"id": "T2", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 70})
+    assert await _usage(client, "V1") == 130
+
+    await client.put("/api/transfers/T2", json={"BatchTotal": 20})
+    assert await _usage(client, "V1") == 80
+
+    # A partial bulk record keeps the columns it leaves out.
+    await client.post("/api/transfers/bulk", json=[{"id": "T1", "BatchTotal": 5}])
+    assert await _usage(client, "V1") == 25
+
+    await client.put("/api/transfers/T2", json={"VehicleId": "V2"})
+    assert (await _usage(client, "V1"), await _usage(client, "V2")) == (5, 20)
+
+    await client.delete("/api/transfers/T2")
+    assert await _usage(client, "V2") == 0
+
+    # Columns that do not move usage leave it alone.
+    await client.put("/api/transfers/T1", json={"Status": "done"})
+    assert await _usage(client, "V1") == 5
+
+
+async def test_flags_follow_usage_over_and_back_under_the_limit(client, now):
+    await client.post("/api/vehicles/", json={"VehicleId": "V1", "MonthLimit": 100})
+    await client.post("/api/transfers/", json={"id": "T1", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 60})
+    await client.post("/api/transfers/", json={"id": "T2", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 60})
+    assert not await _flag(client, "T1")
+    assert await _flag(client, "T2")
+
+    await client.put("/api/transfers/T2", json={"BatchTotal": 10})
+    assert not await _flag(client, "T2")
+
+    await client.put("/api/transfers/T2", json={"BatchTotal": 60})
+    await client.post("/api/transfers/", json={"id": "T3", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 5})
+    assert await _flag(client, "T2") and await _flag(client, "T3")
+
+    # Deleting one transfer unflags the others of the vehicle's month.
+    await client.delete("/api/transfers/T2")
+    assert not await _flag(client, "T3")
+
+    await client.post("/api/transfers/bulk", json=[{"id": "T1", "BatchTotal": 200}])
+    assert await _flag(client, "T1")
+    await client.post("/api/transfers/bulk", json=[{"id": "T1", "BatchTotal": 50}])
+    assert not await _flag(client, "T1")
+
+
+async def test_reject_mode_refuses_transfers_over_the_limit(client, now, monkeypatch):
+    monkeypatch.setattr(vehicle_limits, "VEHICLE_LIMIT_MODE", "reject")
+    await client.post("/api/vehicles/", json={"VehicleId": "V1", "MonthLimit": 100})
+    assert (await client.post("/api/transfers/", json={"id": "T1", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 80})).status_code == 200
+    assert (await client.post("/api/transfers/", json={"id": "T2", "VehicleId": "V1", "DateRealized": now, "BatchTotal": 30})).status_code == 409
+    assert (await client.put("/api/transfers/T1", json={"BatchTotal": 120})).status_code == 409
+    assert (await client.get("/api/transfers/T2")).status_code == 404
+    assert await _usage(client, "V1") == 80